@@ -1,23 +1,23 @@
-import os
-from crewai import Agent, LLM  # 👈 שינוי חשוב: מייבאים את LLM מכאן
+from crewai import Agent
 from dotenv import load_dotenv
 from crewai_tools import SerperDevTool, ScrapeWebsiteTool, FileReadTool, FileWriterTool
+from brains import make_brain  # 👈 כל המוחות נוצרים דרך brains.py
+from model_registry import choose  # 👈 שמות המודלים מגיעים מה-registry
 
 load_dotenv()
 
-# --- הגדרת המוחות באמצעות Groq (מהיר ויציב) ---
+# --- הגדרת המוחות לפי ה-registry (ברירת מחדל: Groq) ---
+smart_model = choose("smart")
 
-# 1. המוח המהיר (Fast Brain) - Groq
-llm_fast = LLM(
-    model="groq/llama-3.3-70b-versatile",
-    api_key=os.getenv("GROQ_API_KEY"),
+# 1. המוח המהיר (Fast Brain)
+llm_fast = make_brain(
+    model=smart_model,
     temperature=0.5
 )
 
-# 2. המוח החכם (Smart Brain) - Groq עם temperature נמוך יותר
-llm_smart = LLM(
-    model="groq/llama-3.3-70b-versatile",
-    api_key=os.getenv("GROQ_API_KEY"),
+# 2. המוח החכם (Smart Brain) - אותו מודל עם temperature נמוך יותר
+llm_smart = make_brain(
+    model=smart_model,
     temperature=0.3
 )
 
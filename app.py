@@ -1,74 +1,82 @@
-import yfinance as yf
 import streamlit as st
-import pandas as pd
+import price_history
+import screener
+import shared_cache
+import statement_table
+from refresh_worker import RefreshWorker
+from chart_cache import fingerprint, shared as chart_cache  # process-wide, shared by all sessions
+from metrics import compute_metrics
 
 # App configuration
 st.set_page_config(layout="wide")
 
 # Sidebar controls
 with st.sidebar:
-    ticker = st.text_input("Enter Ticker Symbol", "AAPL")
+    mode = st.radio("Mode", ["Single Ticker", "Screener"])
+    if mode == "Screener":
+        watchlist = st.text_area("Watchlist (comma or newline separated)",
+                                 "AAPL, MSFT, GOOGL, AMZN, META, NVDA, TSLA, JPM, V, WMT")
+        run_screen = st.button("Run Screen", type="primary")
+    else:
+        ticker = st.text_input("Enter Ticker Symbol", "AAPL")
     timeframe = st.radio("Timeframe", ["Quarterly", "Annual"])
-    metrics = st.multiselect(
-        "Select Metrics",
-        ["Revenue", "Margins", "Debt", "Valuation", "Buybacks"],
-        default=["Revenue", "Margins"]
-    )
-
-# Main content
-st.title(f"Fundamental Analysis: {ticker}")
-
-# Data loading and processing
-@st.cache_data(ttl=3600)  # Cache for 1 hour
-def load_data(ticker):
-    stock = yf.Ticker(ticker)
-    data = {
-        'income_stmt': stock.financials,
-        'balance_sheet': stock.balance_sheet,
-        'cash_flow': stock.cashflow,
-        'quarterly_income_stmt': stock.quarterly_financials,
-        'quarterly_balance_sheet': stock.quarterly_balance_sheet,
-        'quarterly_cash_flow': stock.quarterly_cashflow,
-        'info': stock.info  # Contains valuation metrics
-    }
-    return data
+    if mode != "Screener":
+        metrics = st.multiselect(
+            "Select Metrics",
+            ["Price", "Revenue", "Margins", "Debt", "Valuation", "Buybacks"],
+            default=["Price", "Revenue", "Margins"]
+        )
+        history_window = st.selectbox("History", list(price_history.TIMEFRAMES), index=1)
 
-raw_data = load_data(ticker)
+# Screener view (results live in session_state; the statement store makes re-runs cheap)
+if mode == "Screener":
+    st.title("Screener")
+    tickers = screener.parse_watchlist(watchlist)
+    if run_screen:
+        progress = st.progress(0.0, text="Loading statements...")
+        st.session_state['screen'] = screener.screen(
+            tickers, timeframe.lower(),
+            progress=lambda done, total: progress.progress(done / total, text=f"{done}/{total} tickers")
+        )
+        progress.empty()
+    if 'screen' in st.session_state:
+        # Click a column header to sort
+        st.dataframe(st.session_state['screen'], use_container_width=True)
+    else:
+        st.info(f"{len(tickers)} tickers in the watchlist - press Run Screen.")
+    st.stop()
 
-# Normalization layer
-normalization_layer = {
-    'Total Revenue': 'Total Revenue',
-    'Gross Profit': 'Gross Profit',
-    'Operating Income': 'Operating Income',
-    'Net Income': 'Net Income',
-    'Total Debt': 'Long Term Debt',
-    'Shares Outstanding': 'Common Stock'
-}
+# One background refresher per server process keeps popular tickers warm
+@st.cache_resource
+def refresh_worker():
+    return RefreshWorker().start()
 
-# Process raw yfinance data into standardized format
-def process_financials(raw_data, frequency='annual'):
-    if frequency == 'quarterly':
-        income = raw_data['quarterly_income_stmt']
-        balance = raw_data['quarterly_balance_sheet']
-        cashflow = raw_data['quarterly_cash_flow']
-    else:
-        income = raw_data['income_stmt']
-        balance = raw_data['balance_sheet']
-        cashflow = raw_data['cash_flow']
+# Main content
+st.title(f"Fundamental Analysis: {ticker}")
 
-    # Combine key metrics into single dataframe
-    metrics = pd.DataFrame({
-        'Revenue': income.loc[normalization_layer['Total Revenue']],
-        'Gross Margin': income.loc[normalization_layer['Gross Profit']] / income.loc[normalization_layer['Total Revenue']],
-        'Operating Margin': income.loc[normalization_layer['Operating Income']] / income.loc[normalization_layer['Total Revenue']],
-        'Net Margin': income.loc[normalization_layer['Net Income']] / income.loc[normalization_layer['Total Revenue']],
-        'Total Debt': balance.loc[normalization_layer['Total Debt']],
-        'Shares Outstanding': balance.loc[normalization_layer['Shares Outstanding']]
-    })
+# Data loading and processing (memory-mapped from shared memory, shared by every session and process)
+refresh_worker().track(ticker)
+raw_data = shared_cache.load_data(ticker)
+if raw_data['missing']:
+    # Partial results are not cached, so the next load retries the missing parts
+    st.warning(f"Some data could not be loaded for {ticker}: {', '.join(raw_data['missing'])}")
 
-    return metrics
+# Derive the selected view from the ticker's long-format statement table
+def process_financials(raw_data, frequency='annual', years=None):
+    table = raw_data['statements']
+    income, balance, cashflow = (
+        statement_table.view(table, frequency, statement, years)
+        for statement in ('income_stmt', 'balance_sheet', 'cash_flow')
+    )
+    # All metrics in one vectorized pass (see metrics.METRICS)
+    return compute_metrics(income, balance, cashflow)
 
-processed_data = process_financials(raw_data, timeframe.lower())
+frequency = timeframe.lower()
+years = price_history.TIMEFRAMES[history_window]
+processed_data = chart_cache().get_or_build(
+    (ticker, frequency, years, 'metrics', fingerprint(raw_data['statements'])),
+    lambda: process_financials(raw_data, frequency, years)
+)
 
 # Metric cards
 col1, col2, col3 = st.columns(3)
@@ -80,6 +88,27 @@ with col3:
     st.metric("Debt/Equity", raw_data['info'].get('debtToEquity', 'N/A'))
 
 # Interactive charts
+def load_history(ticker):
+    return shared_cache.shared().get_or_load(f"{shared_cache.cache_key(ticker)}/prices",
+                                             lambda: price_history.load_history(ticker))
+
+if "Price" in metrics:
+    st.subheader("Price History")
+    history = price_history.window(load_history(ticker), history_window)
+    if history.empty:
+        st.info(f"No price history available for {ticker}.")
+    else:
+        # Zooming re-slices the daily bars, so shorter ranges get finer resolution
+        first, last = history.index[0].date(), history.index[-1].date()
+        start, end = st.slider("Zoom", min_value=first, max_value=last, value=(first, last))
+        bars, resolution = chart_cache().get_or_build(
+            (ticker, history_window, 'price', start, end, len(history)),
+            lambda: price_history.downsample(history.loc[str(start):str(end)])
+        )
+        st.caption(f"{resolution} bars ({len(bars)} points)")
+        st.line_chart(bars['Close'], use_container_width=True)
+        st.bar_chart(bars['Volume'], height=150, use_container_width=True)
+
 if "Revenue" in metrics:
     st.subheader("Revenue Trend")
     st.bar_chart(processed_data['Revenue'])
@@ -92,4 +121,11 @@ if "Margins" in metrics:
     with margin_cols[1]:
         st.line_chart(processed_data['Operating Margin'], use_container_width=True)
     with margin_cols[2]:
-        st.line_chart(processed_data['Net Margin'], use_container_width=True)
\ No newline at end of file
+        st.line_chart(processed_data['Net Margin'], use_container_width=True)
+
+# Cache health
+with st.sidebar.expander("Cache Stats"):
+    stats = refresh_worker().stats()
+    st.write(f"Store hit rate: {stats['hit_rate']:.0%} ({stats['hits']} hits / {stats['misses']} misses)")
+    st.write(f"Background refreshes: {stats['refreshed']} ok, {stats['failed']} failed, "
+             f"{stats['tracked']} tickers tracked")
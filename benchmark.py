@@ -0,0 +1,291 @@
+"""
+📏 AGENTIC SOFTWARE HOUSE - Benchmark
+=====================================
+Runs a fixed set of reference prompts through the orchestration layer and
+compares stage latency, token usage and smoke-test pass rate with a baseline.
+
+By default every LLM answer is replayed from benchmarks/recordings/, so the
+numbers measure our own pipeline (prompts, tools, crew wiring) rather than
+the network. Record once against a real or local model, then replay forever.
+
+Usage:
+  python benchmark.py                         # replay recordings, compare to baseline
+  python benchmark.py --record                # call the configured brains and record answers
+  python benchmark.py --model ollama/llama3.1 # run against a local model (no recording)
+  python benchmark.py --update-baseline       # store this run as the new baseline
+  python benchmark.py snake calculator        # run only some cases
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import py_compile
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from crewai import LLM
+from brains import Budget, BudgetedLLM
+
+BENCH_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks")
+RECORDINGS_DIR = os.path.join(BENCH_DIR, "recordings")
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+
+# A run is a regression when it is this much slower / hungrier than the baseline.
+TOLERANCE = 0.20
+
+# =============================================================================
+# 📋 REFERENCE PROMPTS
+# =============================================================================
+
+# The prompts behind the example outputs shipped in this repo (see README).
+REFERENCE_CASES = {
+    "snake": {
+        "pipeline": "build",
+        "prompt": "build a snake game with pygame",
+    },
+    "calculator": {
+        "pipeline": "build",
+        "prompt": "create a calculator with GUI using tkinter",
+    },
+    "todo": {
+        "pipeline": "build",
+        "prompt": "make a todo list app with Flask",
+    },
+    "dashboard": {
+        "pipeline": "main",
+        "prompt": ("A Streamlit dashboard for fundamental stock analysis using yfinance. "
+                   "Sidebar with ticker input, quarterly/annual toggle and metric selection. "
+                   "Show revenue, margins and debt charts plus PE, market cap and debt/equity cards."),
+    },
+}
+
+# =============================================================================
+# 📼 RECORDED BACKEND
+# =============================================================================
+
+class Recording:
+    """Prompt-hash → answer pairs for one benchmark case, stored as JSON."""
+
+    def __init__(self, path):
+        self.path = path
+        self.answers = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.answers = json.load(f)
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(self.answers, f, indent=1, sort_keys=True)
+
+
+class RecordedLLM(LLM):
+    """
+    Answers from a Recording keyed by a hash of the prompt.
+    With `inner` set, misses are forwarded to the real model and recorded.
+    """
+
+    def __init__(self, recording, inner=None):
+        super().__init__(model=inner.model if inner else "recorded")
+        self.recording = recording
+        self.inner = inner
+
+    def call(self, messages, *args, **kwargs):
+        answers = self.recording.answers
+        key = prompt_key(messages)
+        if key not in answers:
+            if self.inner is None:
+                raise KeyError(f"No recorded answer in {self.recording.path} - run with --record first")
+            self.inner.stop = self.stop
+            answers[key] = self.inner.call(messages, *args, **kwargs)
+        return answers[key]
+
+
+def prompt_key(messages):
+    blob = json.dumps(messages, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:32]
+
+
+@contextmanager
+def swapped_brains(agents, make_backend):
+    """
+    Replaces the model behind every agent's brain with make_backend(original_model),
+    keeping the budget wrapper in place so tokens and calls are still counted.
+    """
+    brains = {id(a.llm): a.llm for a in agents if isinstance(a.llm, BudgetedLLM)}
+    saved = {key: (b.inner, b.fallback) for key, b in brains.items()}
+    for brain in brains.values():
+        brain.inner, brain.fallback = make_backend(brain.inner), None
+    try:
+        yield
+    finally:
+        for key, brain in brains.items():
+            brain.inner, brain.fallback = saved[key]
+
+# =============================================================================
+# ⏱️ MEASUREMENT
+# =============================================================================
+
+class StageBudget(Budget):
+    """An unlimited budget that also times each task of the crew."""
+
+    def start(self):
+        super().start()
+        self.stages = []
+        self._stage_started = time.monotonic()
+
+    def task_done(self, output=None):
+        now = time.monotonic()
+        stage = getattr(output, "agent", None) or f"task {self.tasks_done + 1}"
+        self.stages.append({"stage": stage, "seconds": round(now - self._stage_started, 3),
+                            "tokens": self.task_tokens, "calls": self.task_calls})
+        self._stage_started = now
+        super().task_done(output)
+
+
+def smoke_test(directory):
+    """Passes when the crew wrote at least one .py file and every one of them compiles."""
+    files = [os.path.join(root, name)
+             for root, _, names in os.walk(directory) for name in names if name.endswith(".py")]
+    errors = []
+    for path in files:
+        try:
+            py_compile.compile(path, doraise=True)
+        except py_compile.PyCompileError as e:
+            errors.append(str(e))
+    return {"passed": bool(files) and not errors, "files": len(files), "errors": errors}
+
+
+def run_case(name, case, make_backend):
+    budget = StageBudget()
+    workdir = tempfile.mkdtemp(prefix=f"bench_{name}_")
+    cwd = os.getcwd()
+    os.chdir(workdir)  # FileWriterTool writes relative to the working directory
+    try:
+        if case["pipeline"] == "build":
+            import build
+            agents = [build.project_manager, build.developer, build.qa_engineer]
+            with swapped_brains(agents, make_backend):
+                build.build(case["prompt"], budget=budget)
+        else:
+            import main
+            from crewai import Crew, Process
+            tasks = main.create_tasks_for_project(case["prompt"])
+            agents = list({id(t.agent): t.agent for t in tasks}.values())
+            crew = Crew(agents=agents, tasks=tasks, process=Process.sequential,
+                        task_callback=budget.task_done)
+            with swapped_brains(agents, make_backend), budget.activate():
+                crew.kickoff()
+    finally:
+        os.chdir(cwd)
+
+    return {
+        "seconds": round(budget.elapsed(), 3),
+        "tokens": budget.tokens,
+        "calls": budget.calls,
+        "stages": budget.stages,
+        "smoke": smoke_test(workdir),
+        "workdir": workdir,
+    }
+
+# =============================================================================
+# 📊 BASELINE COMPARISON
+# =============================================================================
+
+def compare(results, baseline):
+    """Returns a list of human-readable regressions against the baseline."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        for metric in ("seconds", "tokens", "calls"):
+            if base[metric] and result[metric] > base[metric] * (1 + TOLERANCE):
+                regressions.append(f"{name}: {metric} {base[metric]} → {result[metric]}")
+        if base["passed"] and not result["smoke"]["passed"]:
+            regressions.append(f"{name}: smoke test now fails")
+    return regressions
+
+
+def load_baseline():
+    if not os.path.exists(BASELINE_PATH):
+        return {}
+    with open(BASELINE_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(results):
+    baseline = load_baseline()
+    for name, result in results.items():
+        baseline[name] = {"seconds": result["seconds"], "tokens": result["tokens"],
+                          "calls": result["calls"], "passed": result["smoke"]["passed"]}
+    os.makedirs(BENCH_DIR, exist_ok=True)
+    with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+
+# =============================================================================
+# 🚀 MAIN
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Agentic Software House pipelines")
+    parser.add_argument("cases", nargs="*", help="cases to run (default: all)")
+    parser.add_argument("--record", action="store_true", help="record answers from the real brains")
+    parser.add_argument("--model", help="run against this model (e.g. ollama/llama3.1) without recording")
+    parser.add_argument("--update-baseline", action="store_true", help="save this run as the baseline")
+    args = parser.parse_args()
+
+    names = args.cases or list(REFERENCE_CASES)
+    results = {}
+    crashed, skipped = [], []
+    for name in names:
+        case = REFERENCE_CASES[name]
+        recording = Recording(os.path.join(RECORDINGS_DIR, f"{name}.json"))
+        if args.model:
+            make_backend = lambda inner: LLM(model=args.model, temperature=inner.temperature)
+        elif args.record:
+            make_backend = lambda inner: RecordedLLM(recording, inner)
+        elif recording.answers:
+            make_backend = lambda inner: RecordedLLM(recording)
+        else:
+            print(f"⏭️  {name}: no recording yet (run with --record)")
+            skipped.append(name)
+            continue
+
+        print(f"\n▶️  {name} ({case['pipeline']}): \"{case['prompt'][:60]}\"")
+        try:
+            results[name] = result = run_case(name, case, make_backend)
+        except Exception as e:
+            print(f"   💥 {name} crashed: {e}")
+            crashed.append(name)
+            continue
+        finally:
+            if args.record:
+                recording.save()
+        verdict = "✅ PASS" if result["smoke"]["passed"] else "❌ FAIL"
+        print(f"   {verdict}  {result['seconds']}s  {result['tokens']} tokens  {result['calls']} calls")
+        for stage in result["stages"]:
+            print(f"      {stage['stage']:<30} {stage['seconds']:>8}s {stage['tokens']:>8} tokens")
+
+    if results or crashed:
+        # Crashed cases count as failures; skipped ones were never run
+        passed = sum(r["smoke"]["passed"] for r in results.values())
+        print(f"\n📊 Pass rate: {passed}/{len(results) + len(crashed)}")
+    if skipped:
+        print(f"⏭️  Skipped (no recording): {', '.join(skipped)}")
+
+    regressions = compare(results, load_baseline())
+    regressions += [f"{name}: crashed" for name in crashed]
+    for regression in regressions:
+        print(f"⚠️  Regression - {regression}")
+
+    if args.update_baseline:
+        save_baseline(results)
+        print(f"💾 Baseline updated: {BASELINE_PATH}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
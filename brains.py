@@ -0,0 +1,627 @@
+"""
+🧠 AGENTIC SOFTWARE HOUSE - Brains
+==================================
+The shared LLM layer used by build.py, main.py and agents.py.
+
+Every brain handed to an Agent is created with make_brain(), so limits that
+apply to all LLM traffic live here instead of being copied into each script.
+make_brain() also routes all LLM and tool traffic through the shared
+connection pools in transport.py.
+
+Budgets are read from the environment (all optional, empty = unlimited):
+  BUILD_MAX_TOKENS, BUILD_MAX_CALLS, BUILD_MAX_SECONDS   - per build
+  TASK_MAX_TOKENS,  TASK_MAX_CALLS                       - per task
+  BUILD_FALLBACK_MODEL                                   - model used when a budget runs low
+                                                           (default: the registry's "fast" model)
+
+API keys come from model_registry, so any provider it knows about works.
+
+Each brain is a ProviderPool: the requested model first, then the same
+role's model at every other provider with a key set. Providers that time
+out, cannot be reached, rate-limit or return a 5xx are cooled down and the
+call moves on to the next one; errors in the request itself (400, 401,
+403, context window exceeded) are raised straight away:
+  LLM_FAILOVER=0                                         - use the requested model only
+  LLM_HEDGE_PERCENTILE                                   - e.g. 95: if the primary has not
+                                                           answered within its p95 latency,
+                                                           ask the next provider too and take
+                                                           whichever answers first (off by default)
+
+Identical calls that are in flight at the same time in this process (same
+model, temperature, stop words, tools and messages) share one request, and
+the answer goes to every caller. Separate processes do not share requests.
+Calls that pass available_functions are never shared:
+  LLM_COALESCE=0                                         - always send every call
+"""
+
+import contextvars
+import datetime
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from contextlib import contextmanager
+from contextvars import ContextVar
+from types import SimpleNamespace
+import httpx
+from crewai import LLM
+import model_registry
+import transport
+
+
+# Rough average for English prose and code with Llama-style tokenizers.
+CHARS_PER_TOKEN = 4
+
+# Provider health: how long a failing provider is skipped (doubling per failure)
+FAILURE_COOLDOWN_SECONDS = 5
+RATE_LIMIT_COOLDOWN_SECONDS = 30
+MAX_COOLDOWN_SECONDS = 300
+# Hedging only starts once the primary has this many latency samples
+HEDGE_MIN_SAMPLES = 10
+HEDGE_MIN_SECONDS = 0.5
+# At most this many hedges in flight; beyond that, slow calls are not hedged
+HEDGE_MAX_IN_FLIGHT = 32
+
+# =============================================================================
+# 💰 BUDGETS
+# =============================================================================
+
+class BudgetExceeded(RuntimeError):
+    """Raised when a build or task has used up its tokens, calls or time."""
+
+    def __init__(self, reason, usage):
+        super().__init__(f"Budget exceeded: {reason}")
+        self.reason = reason
+        self.usage = usage
+
+
+class Budget:
+    """
+    Token, call and wall-clock limits for one build.
+    Limits set to None are not enforced. Once usage passes `degrade_at`
+    (a fraction of the tightest limit), brains switch to their fallback model
+    and compact the conversation before giving up completely.
+    """
+
+    def __init__(self, max_tokens=None, max_calls=None, max_seconds=None,
+                 task_max_tokens=None, task_max_calls=None, degrade_at=0.8):
+        self.max_tokens = max_tokens
+        self.max_calls = max_calls
+        self.max_seconds = max_seconds
+        self.task_max_tokens = task_max_tokens
+        self.task_max_calls = task_max_calls
+        self.degrade_at = degrade_at
+        self._lock = threading.Lock()
+        self._cancelled = threading.Event()
+        self.start()
+
+    @classmethod
+    def from_env(cls):
+        """Builds a budget from the BUILD_* / TASK_* environment variables."""
+        return cls(
+            max_tokens=_env_number("BUILD_MAX_TOKENS"),
+            max_calls=_env_number("BUILD_MAX_CALLS"),
+            max_seconds=_env_number("BUILD_MAX_SECONDS", float),
+            task_max_tokens=_env_number("TASK_MAX_TOKENS"),
+            task_max_calls=_env_number("TASK_MAX_CALLS"),
+        )
+
+    def start(self):
+        """Resets all counters and the clock."""
+        with self._lock:
+            self.started_at = time.monotonic()
+            self.tokens = 0
+            self.calls = 0
+            self.task_tokens = 0
+            self.task_calls = 0
+            self.tasks_done = 0
+
+    def task_done(self, _output=None):
+        """Crew task_callback: the next task starts with a fresh per-task allowance."""
+        with self._lock:
+            self.tasks_done += 1
+            self.task_tokens = 0
+            self.task_calls = 0
+
+    def charge(self, tokens):
+        """Records one LLM call that used `tokens` tokens."""
+        with self._lock:
+            self.tokens += tokens
+            self.calls += 1
+            self.task_tokens += tokens
+            self.task_calls += 1
+
+    def elapsed(self):
+        return time.monotonic() - self.started_at
+
+    def pressure(self):
+        """How close we are to the tightest limit (0.0 = fresh, 1.0 = exhausted)."""
+        used = [
+            (self.tokens, self.max_tokens),
+            (self.calls, self.max_calls),
+            (self.elapsed(), self.max_seconds),
+            (self.task_tokens, self.task_max_tokens),
+            (self.task_calls, self.task_max_calls),
+        ]
+        return max([value / limit for value, limit in used if limit] or [0.0])
+
+    def cancel(self):
+        """Makes the next LLM call charged to this budget raise BudgetExceeded."""
+        self._cancelled.set()
+
+    def check(self):
+        """Raises BudgetExceeded if any limit has been reached or the budget was cancelled."""
+        if self._cancelled.is_set():
+            raise BudgetExceeded("cancelled", self.usage())
+        limits = [
+            ("build tokens", self.tokens, self.max_tokens),
+            ("build calls", self.calls, self.max_calls),
+            ("build time", self.elapsed(), self.max_seconds),
+            ("task tokens", self.task_tokens, self.task_max_tokens),
+            ("task calls", self.task_calls, self.task_max_calls),
+        ]
+        for name, value, limit in limits:
+            if limit and value >= limit:
+                raise BudgetExceeded(f"{name} limit of {limit} reached", self.usage())
+
+    def usage(self):
+        return {
+            "tokens": self.tokens,
+            "calls": self.calls,
+            "seconds": round(self.elapsed(), 1),
+            "tasks_done": self.tasks_done,
+        }
+
+    @contextmanager
+    def activate(self):
+        """Makes this the budget charged by every brain called inside the block."""
+        token = _active_budget.set(self)
+        try:
+            yield self
+        finally:
+            _active_budget.reset(token)
+
+
+# A context variable rather than an attribute on the LLM, so concurrent builds
+# sharing the same module-level brains are still charged separately.
+_active_budget = ContextVar("active_budget", default=None)
+
+
+def active_budget():
+    return _active_budget.get()
+
+
+def _env_number(name, kind=int):
+    value = os.getenv(name, "").strip()
+    return kind(value) if value else None
+
+# =============================================================================
+# ✂️ CONTEXT HELPERS
+# =============================================================================
+
+def estimate_tokens(content):
+    """Cheap, provider-agnostic token estimate for a prompt or a completion."""
+    if content is None:
+        return 0
+    if isinstance(content, str):
+        return len(content) // CHARS_PER_TOKEN + 1
+    return sum(estimate_tokens(m.get("content") if isinstance(m, dict) else str(m))
+               for m in content)
+
+
+def compact_messages(messages, keep_last=2, max_chars=1200):
+    """
+    Shrinks a conversation so a nearly exhausted budget goes further.
+    The system prompt, the original request and the last few turns are kept;
+    everything in between is cut down to its beginning and end.
+    """
+    if isinstance(messages, str) or len(messages) <= keep_last + 2:
+        return messages
+
+    head = max_chars // 2
+    compacted = list(messages[:2])
+    for message in messages[2:-keep_last]:
+        content = message.get("content") or ""
+        if len(content) > max_chars:
+            content = f"{content[:head]}\n[... trimmed to save tokens ...]\n{content[-head:]}"
+        compacted.append({**message, "content": content})
+    compacted.extend(messages[-keep_last:])
+    return compacted
+
+# =============================================================================
+# 🧠 BRAINS
+# =============================================================================
+
+class BudgetedLLM(LLM):
+    """
+    An LLM that forwards to `inner` while charging the active Budget.
+    When the budget runs low it switches to `fallback` (a smaller model)
+    with a compacted context, and raises BudgetExceeded once it is spent.
+    """
+
+    def __init__(self, inner, fallback=None):
+        super().__init__(model=inner.model, temperature=inner.temperature,
+                         api_key=inner.api_key)
+        self.inner = inner
+        self.fallback = fallback
+
+    def call(self, messages, *args, **kwargs):
+        budget = active_budget()
+        if budget is None:
+            return forward_call(self, self.inner, messages, *args, **kwargs)
+
+        budget.check()
+        target = self.inner
+        if budget.pressure() >= budget.degrade_at:
+            target = self.fallback or self.inner
+            messages = compact_messages(messages)
+
+        result = forward_call(self, target, messages, *args, **kwargs)
+        budget.charge(estimate_tokens(messages) + estimate_tokens(result))
+        return result
+
+
+def forward_call(wrapper, target, messages, *args, **kwargs):
+    """Calls `target` on behalf of `wrapper`, carrying over the stop words the agent set."""
+    target.stop = wrapper.stop
+    return target.call(messages, *args, **kwargs)
+
+# =============================================================================
+# 🛟 FAILOVER
+# =============================================================================
+
+class ProviderHealth:
+    """Recent latencies and failures of one model, shared by every brain that uses it."""
+
+    def __init__(self, window=100):
+        self.latencies = deque(maxlen=window)
+        self.calls = 0
+        self.errors = 0
+        self.failures = 0  # consecutive
+        self.cooldown_until = 0.0
+        self.hedges = 0
+        self.hedges_won = 0
+        self._lock = threading.Lock()
+
+    def success(self, seconds):
+        with self._lock:
+            self.calls += 1
+            self.failures = 0
+            self.cooldown_until = 0.0
+            self.latencies.append(seconds)
+
+    def failure(self, error):
+        with self._lock:
+            self.calls += 1
+            self.errors += 1
+            self.failures += 1
+            base = RATE_LIMIT_COOLDOWN_SECONDS if _is_rate_limit(error) else FAILURE_COOLDOWN_SECONDS
+            cooldown = min(MAX_COOLDOWN_SECONDS, base * 2 ** (self.failures - 1))
+            self.cooldown_until = time.monotonic() + cooldown
+
+    def hedged(self, won=False):
+        """Counts a hedge sent for this model, and whether the hedge answered first."""
+        with self._lock:
+            self.hedges += not won
+            self.hedges_won += won
+
+    def healthy(self):
+        return time.monotonic() >= self.cooldown_until
+
+    def percentile(self, p):
+        with self._lock:
+            samples = sorted(self.latencies)
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * p / 100))]
+
+    def stats(self):
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "hedges": self.hedges,
+            "hedges_won": self.hedges_won,
+            "healthy": self.healthy(),
+        }
+
+
+def _is_rate_limit(error):
+    return getattr(error, "status_code", None) == 429 or "RateLimit" in type(error).__name__
+
+
+# Exception class names (httpx, openai, litellm) that mean the provider, not the request, failed
+TRANSIENT_ERRORS = ("Timeout", "Connection", "RateLimit", "ServiceUnavailable", "InternalServer")
+
+
+def is_transient(error):
+    """True for errors worth retrying elsewhere: timeouts, connection errors, 429 and 5xx."""
+    status = getattr(error, "status_code", None)
+    if isinstance(status, int):
+        return status in (408, 429) or status >= 500
+    if isinstance(error, (TimeoutError, ConnectionError, httpx.TransportError)):
+        return True
+    return any(name in type(error).__name__ for name in TRANSIENT_ERRORS)
+
+
+_health = {}
+_health_lock = threading.Lock()
+
+
+def health(model):
+    with _health_lock:
+        return _health.setdefault(model, ProviderHealth())
+
+
+def provider_stats():
+    with _health_lock:
+        models = dict(_health)
+    return {model: h.stats() for model, h in models.items()}
+
+
+def format_provider_stats():
+    parts = []
+    for model, stats in provider_stats().items():
+        latency = f", p95 {stats['p95']:.1f}s" if stats["p95"] is not None else ""
+        hedged = f", {stats['hedges_won']}/{stats['hedges']} hedges won" if stats["hedges"] else ""
+        parts.append(f"{model}: {stats['calls']} calls, {stats['errors']} errors{latency}{hedged}")
+    if _single_flight.shared:
+        parts.append(f"{_single_flight.shared} calls shared an identical in-flight request")
+    return "; ".join(parts) or "no LLM calls"
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls with the same key into one: the first caller
+    runs it, later ones wait for its result (or its exception).
+    Nothing is cached - once the call returns, the next one runs again.
+    Only threads of one process can share a call.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.shared = 0
+
+    def do(self, key, fn):
+        """Returns (result, shared): shared is True for a caller that got another's result."""
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+            else:
+                self.shared += 1
+        if not leader:
+            return future.result(), True
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+_single_flight = SingleFlight()
+
+
+def request_key(llm, messages, kwargs):
+    """What makes two calls interchangeable. Callbacks are per-caller and left out."""
+    request = {
+        "model": llm.model,
+        "temperature": llm.temperature,
+        "stop": llm.stop,
+        "tools": kwargs.get("tools"),
+        "messages": messages,
+    }
+    return json.dumps(request, sort_keys=True, default=str)
+
+
+def report_shared_call(callbacks, messages, result, started):
+    """
+    Gives a caller's callbacks (crewai's token counter among them) the
+    success event they would have seen for their own request. Usage is the
+    same estimate the budgets use, since the real one belongs to the leader.
+    """
+    prompt_tokens, completion_tokens = estimate_tokens(messages), estimate_tokens(result)
+    usage = SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens,
+                            total_tokens=prompt_tokens + completion_tokens,
+                            prompt_tokens_details=None)
+    response = {"usage": usage, "choices": [{"message": {"role": "assistant", "content": result}}]}
+    for callback in callbacks or []:
+        if hasattr(callback, "log_success_event"):
+            callback.log_success_event({"messages": messages}, response, started, datetime.datetime.now())
+
+
+_hedge_slots = threading.BoundedSemaphore(HEDGE_MAX_IN_FLIGHT)
+
+
+class ProviderPool(LLM):
+    """
+    An LLM that forwards to the first healthy member, in order of preference.
+    A member that fails transiently is cooled down and the call fails over
+    to the next; the last error is raised only when every member has failed.
+    Any other error is the request's fault and is raised as is.
+
+    With `hedge_percentile` set, a call that has not come back within that
+    percentile of the first member's recent latency is also sent to the
+    next member, and the first answer wins. The slower call still runs to
+    completion (and is recorded in the health stats), so hedging trades some
+    extra tokens for a shorter tail. Each call gets its own thread, so time
+    spent waiting for a worker never counts as latency, and when
+    HEDGE_MAX_IN_FLIGHT hedges are already running no more are sent.
+    """
+
+    def __init__(self, members, hedge_percentile=None):
+        primary = members[0]
+        super().__init__(model=primary.model, temperature=primary.temperature,
+                         api_key=primary.api_key)
+        self.members = members
+        self.hedge_percentile = hedge_percentile
+
+    def candidates(self):
+        """Healthy members in order of preference, then the rest, soonest out of cooldown first."""
+        healthy = [m for m in self.members if health(m.model).healthy()]
+        cooling = sorted((m for m in self.members if m not in healthy),
+                         key=lambda m: health(m.model).cooldown_until)
+        return healthy + cooling
+
+    def call(self, messages, *args, **kwargs):
+        # Tool calls run the caller's own functions, so they are never shared
+        if args or kwargs.get("available_functions") or os.getenv("LLM_COALESCE", "1") == "0":
+            return self._call(messages, *args, **kwargs)
+        started = datetime.datetime.now()
+        result, shared = _single_flight.do(request_key(self, messages, kwargs),
+                                           lambda: self._call(messages, **kwargs))
+        if shared:
+            report_shared_call(kwargs.get("callbacks"), messages, result, started)
+        return result
+
+    def _call(self, messages, *args, **kwargs):
+        candidates = self.candidates()
+        delay = self._hedge_delay(candidates[0])
+        if delay is not None and len(candidates) > 1:
+            return self._hedged(candidates, delay, messages, *args, **kwargs)
+        return self._in_turn(candidates, None, messages, *args, **kwargs)
+
+    def _attempt(self, member, messages, *args, **kwargs):
+        started = time.monotonic()
+        try:
+            result = forward_call(self, member, messages, *args, **kwargs)
+        except Exception as e:
+            if is_transient(e):
+                health(member.model).failure(e)
+            raise
+        health(member.model).success(time.monotonic() - started)
+        return result
+
+    def _in_turn(self, candidates, error, messages, *args, **kwargs):
+        for member in candidates:
+            try:
+                return self._attempt(member, messages, *args, **kwargs)
+            except Exception as e:
+                if not is_transient(e):
+                    raise
+                error = e
+        raise error
+
+    def _hedge_delay(self, member):
+        if not self.hedge_percentile:
+            return None
+        stats = health(member.model)
+        if len(stats.latencies) < HEDGE_MIN_SAMPLES:
+            return None
+        return max(HEDGE_MIN_SECONDS, stats.percentile(self.hedge_percentile))
+
+    def _start(self, member, slot, messages, *args, **kwargs):
+        """Runs one attempt on a thread of its own; `slot` is released when it ends."""
+        future = Future()
+        # A copy of the caller's context, so the active budget is visible
+        context = contextvars.copy_context()
+
+        def run():
+            try:
+                future.set_result(context.run(self._attempt, member, messages, *args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+            finally:
+                if slot:
+                    _hedge_slots.release()
+        threading.Thread(target=run, daemon=True, name=f"llm-{member.model}").start()
+        return future
+
+    def _hedged(self, candidates, delay, messages, *args, **kwargs):
+        primary, backup = candidates[0], candidates[1]
+        pending = {self._start(primary, False, messages, *args, **kwargs): primary}
+        done, _ = wait(pending, timeout=delay)
+        if not done and _hedge_slots.acquire(blocking=False):
+            health(primary.model).hedged()
+            pending[self._start(backup, True, messages, *args, **kwargs)] = backup
+        tried = list(pending.values())
+
+        error = None
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                member = pending.pop(future)
+                if future.exception() is None:
+                    if member is backup:
+                        health(primary.model).hedged(won=True)
+                    return future.result()
+                error = future.exception()
+                if not is_transient(error):
+                    raise error
+        # Everything sent so far failed: carry on with the rest, one at a time
+        rest = [m for m in candidates if m not in tried]
+        return self._in_turn(rest, error, messages, *args, **kwargs)
+
+
+def make_pool(model, temperature, registry=None):
+    """`model` plus, unless LLM_FAILOVER=0, its stand-ins at the other configured providers."""
+    registry = registry or model_registry.default_registry()
+    models = [model]
+    if os.getenv("LLM_FAILOVER", "1") != "0":
+        models += registry.alternatives(model)
+    members = [LLM(model=m, api_key=registry.api_key(m), temperature=temperature) for m in models]
+    return ProviderPool(members, hedge_percentile=_env_number("LLM_HEDGE_PERCENTILE", float))
+
+
+def make_brain(model, temperature):
+    """Creates a brain for an Agent: the requested model plus its budget fallback."""
+    transport.install()
+    registry = model_registry.default_registry()
+    inner = make_pool(model, temperature, registry)
+    fallback_model = os.getenv("BUILD_FALLBACK_MODEL") or registry.choose("fast")
+    fallback = None
+    if fallback_model != model:
+        fallback = make_pool(fallback_model, temperature, registry)
+    return BudgetedLLM(inner, fallback)
+
+
+def save_partial_results(tasks, error, path="build_partial.md"):
+    """Writes the output of every task that finished before the budget ran out."""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"# Partial build results\n\nStopped early: {error.reason}\n")
+        f.write(f"Usage: {error.usage}\n")
+        for task in tasks:
+            if task.output is None:
+                continue
+            output = getattr(task.output, "raw", task.output)
+            f.write(f"\n## {task.agent.role}\n\n{output}\n")
+    return path
+
+
+def check_api_key(model=None, timeout=10):
+    """
+    Makes one cheap authenticated request to the provider of `model` (default:
+    the registry's "smart" model) through the shared connection pool, so the
+    connection it opens is reused by the first real LLM call.
+    Returns None when the key works, otherwise a short description of the problem.
+    """
+    registry = model_registry.default_registry()
+    model = model or registry.choose("smart")
+    provider = registry.provider(model)
+    if provider not in model_registry.PROVIDERS:
+        return None  # a provider the registry does not know how to check
+    variables, url = model_registry.PROVIDERS[provider]
+    key = model_registry.provider_key(provider)
+    if not key:
+        return f"{' / '.join(variables)} is not set"
+    headers, params = model_registry.auth(provider, key)
+    try:
+        response = transport.client().get(url, headers=headers, params=params, timeout=timeout)
+    except httpx.HTTPError as e:
+        return f"Could not reach {provider}: {e}"
+    if response.status_code in (400, 401, 403):
+        name = next(v for v in variables if os.getenv(v))
+        return f"{name} was rejected by {provider}"
+    return None  # rate limits and server errors are not the key's fault
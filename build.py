@@ -7,24 +7,35 @@ Usage:
   python build.py "build me a snake game"
   python build.py "create a todo app with Flask"
   python build.py "make a calculator with GUI"
+
+From asyncio code, use abuild() to stream progress events instead.
 """
 
+import asyncio
+import contextvars
+import json
 import os
 import sys
-from crewai import Agent, Task, Crew, Process, LLM
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from crewai import Agent, Task, Crew, Process
 from crewai_tools import FileWriterTool, FileReadTool
 from dotenv import load_dotenv
+from brains import Budget, BudgetExceeded, format_provider_stats, make_brain, save_partial_results
+from model_registry import choose
+from transport import format_stats
 
 load_dotenv()
 
 # =============================================================================
-# 🧠 AI BRAIN (Groq - Fast & Reliable)
+# 🧠 AI BRAIN (from the model registry - Groq by default)
 # =============================================================================
 
-# Using smaller model to avoid rate limits
-llm = LLM(
-    model="groq/llama-3.1-8b-instant",  # Smaller, faster, less rate limiting
-    api_key=os.getenv("GROQ_API_KEY"),
+# The registry's "fast" model: smaller, faster, less rate limiting
+llm = make_brain(
+    model=choose("fast"),
     temperature=0.3
 )
 
@@ -80,17 +91,12 @@ qa_engineer = Agent(
 # 🎯 BUILD FUNCTION
 # =============================================================================
 
-def build(user_request: str):
+def create_build_tasks(user_request: str, team=None):
     """
-    Takes a simple request and builds the project.
-    Example: build("make me a snake game")
+    Creates the plan → code → QA tasks for one request.
+    `team` is a (project manager, developer, QA) tuple; defaults to the module agents.
     """
-    
-    print("\n" + "="*60)
-    print("🏢 AGENTIC SOFTWARE HOUSE")
-    print("="*60)
-    print(f"\n📝 Your request: \"{user_request}\"\n")
-    print("🚀 Starting build process...\n")
+    team = team or (project_manager, developer, qa_engineer)
     
     # Task 1: PM expands the request
     task_plan = Task(
@@ -106,7 +112,7 @@ def build(user_request: str):
         Keep it concise - max 15 lines. Focus on actionable details.
         """,
         expected_output="A brief, clear project plan with tech stack and features",
-        agent=project_manager
+        agent=team[0]
     )
     
     # Task 2: Developer writes the code
@@ -127,7 +133,7 @@ def build(user_request: str):
         based on what you're building (e.g., snake_game.py, calculator.py, app.py)
         """,
         expected_output="Complete, working code saved to file(s)",
-        agent=developer
+        agent=team[1]
     )
     
     # Task 3: QA validates
@@ -146,26 +152,199 @@ def build(user_request: str):
         End with: "✅ READY TO RUN" or "❌ NEEDS FIXES: [list issues]"
         """,
         expected_output="QA validation result",
-        agent=qa_engineer
+        agent=team[2]
     )
     
+    return [task_plan, task_code, task_qa]
+
+def build(user_request: str, budget: Budget = None):
+    """
+    Takes a simple request and builds the project.
+    Example: build("make me a snake game")
+
+    The build stops early once `budget` (default: BUILD_*/TASK_* env vars)
+    is spent; whatever the finished tasks produced is saved to build_partial.md.
+    """
+    budget = budget or Budget.from_env()
+    
+    print("\n" + "="*60)
+    print("🏢 AGENTIC SOFTWARE HOUSE")
+    print("="*60)
+    print(f"\n📝 Your request: \"{user_request}\"\n")
+    print("🚀 Starting build process...\n")
+    
     # Assemble and run
+    tasks = create_build_tasks(user_request)
     crew = Crew(
         agents=[project_manager, developer, qa_engineer],
-        tasks=[task_plan, task_code, task_qa],
+        tasks=tasks,
         verbose=True,
-        process=Process.sequential
+        process=Process.sequential,
+        task_callback=budget.task_done
     )
     
-    result = crew.kickoff()
+    budget.start()
+    try:
+        with budget.activate():
+            result = crew.kickoff()
+    except BudgetExceeded as e:
+        path = save_partial_results(tasks, e)
+        print("\n" + "="*60)
+        print("⛔ BUILD STOPPED - BUDGET EXCEEDED")
+        print("="*60)
+        print(f"\n{e}\nUsage: {e.usage}")
+        print(f"📄 Partial results saved to {path}\n")
+        return None
     
     print("\n" + "="*60)
     print("🎉 BUILD COMPLETE!")
     print("="*60)
     print(f"\nResult: {result}\n")
+    print(f"🌐 Connections: {format_stats()}")
+    print(f"🛟 Providers: {format_provider_stats()}\n")
     
     return result
 
+# =============================================================================
+# ⚡ ASYNC BUILD API
+# =============================================================================
+
+# crewai's kickoff() is synchronous, so each async build still occupies one
+# worker thread while it runs. A dedicated pool keeps those threads from
+# starving asyncio's default executor and caps how many crews run at once;
+# builds beyond the cap simply wait their turn without blocking the loop.
+_build_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("ASYNC_BUILD_WORKERS", "64")),
+    thread_name_prefix="build"
+)
+
+
+@dataclass
+class BuildEvent:
+    """One progress update from abuild()."""
+    kind: str            # task_started, tool_called, file_written, task_completed, build_completed
+    task: str = None     # role of the agent working on the current task
+    detail: str = None   # tool name / file name / task output
+    result: object = None
+    partial_path: str = None  # build_completed only: where partial results were saved, if any
+
+
+class BuildCancelled(Exception):
+    """Raised inside the crew's worker thread to stop a cancelled build."""
+
+
+def _written_filename(tool_input):
+    """Pulls the filename out of a FileWriterTool call (a dict or its JSON)."""
+    try:
+        args = json.loads(tool_input) if isinstance(tool_input, str) else tool_input
+        return args.get("filename")
+    except (ValueError, AttributeError):
+        return None
+
+
+async def abuild(user_request: str, budget: Budget = None, timeout: float = None,
+                 partial_path: str = None):
+    """
+    Builds the project like build(), yielding BuildEvents as it goes:
+
+        async for event in abuild("build me a snake game", timeout=900):
+            print(event.kind, event.task, event.detail)
+
+    Stopping the iteration, cancelling the awaiting task or hitting `timeout`
+    (raises TimeoutError) returns control to the caller at once, and a build
+    still waiting for a worker never starts. The event loop is never blocked.
+    The last event is build_completed; its `result` is the crew output, or
+    None if the budget ran out. Partial results then go to `partial_path`
+    (default: build_partial_<build id>.md, so concurrent builds never share
+    a file), which the event's `partial_path` names.
+
+    Limitation: crewai's kickoff() is synchronous (its kickoff_async() only
+    wraps it in a thread), so a running build holds one _build_executor
+    thread until it ends. A cancelled build finishes the LLM call or tool it
+    is in and stops at its next step; that work still counts against the
+    ASYNC_BUILD_WORKERS cap until then.
+    """
+    budget = budget or Budget.from_env()
+    partial_path = partial_path or f"build_partial_{uuid.uuid4().hex[:12]}.md"
+    saved = []  # partial_path, once written
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    cancelled = threading.Event()
+    done = object()
+
+    # Each build gets its own agents (they keep per-run state) sharing the same brains.
+    team = (project_manager.copy(), developer.copy(), qa_engineer.copy())
+    tasks = create_build_tasks(user_request, team)
+    roles = [task.agent.role for task in tasks]
+    current = [0]
+
+    def emit(kind, **fields):
+        if cancelled.is_set():
+            raise BuildCancelled()
+        loop.call_soon_threadsafe(queue.put_nowait, BuildEvent(kind, **fields))
+
+    def on_step(step):
+        tool = getattr(step, "tool", None)
+        if tool:
+            emit("tool_called", task=roles[current[0]], detail=tool)
+            if tool == file_writer.name:
+                emit("file_written", task=roles[current[0]],
+                     detail=_written_filename(getattr(step, "tool_input", None)))
+        elif cancelled.is_set():
+            raise BuildCancelled()
+
+    def on_task_done(output):
+        budget.task_done(output)
+        emit("task_completed", task=roles[current[0]], detail=getattr(output, "raw", str(output)))
+        current[0] += 1
+        if current[0] < len(tasks):
+            emit("task_started", task=roles[current[0]])
+
+    def run():
+        if cancelled.is_set():
+            return None  # cancelled while waiting for a worker
+        crew = Crew(
+            agents=list(team),
+            tasks=tasks,
+            process=Process.sequential,
+            step_callback=on_step,
+            task_callback=on_task_done
+        )
+        budget.start()
+        emit("task_started", task=roles[0])
+        try:
+            with budget.activate():
+                return crew.kickoff()
+        except BudgetExceeded as e:
+            saved.append(save_partial_results(tasks, e, partial_path))
+            return None
+        except BuildCancelled:
+            return None  # nobody is listening any more
+
+    def finished(future):
+        loop.call_soon_threadsafe(queue.put_nowait, done)
+
+    future = loop.run_in_executor(_build_executor, contextvars.copy_context().run, run)
+    future.add_done_callback(finished)
+    deadline = loop.time() + timeout if timeout else None
+
+    try:
+        while True:
+            remaining = deadline - loop.time() if deadline else None
+            try:
+                event = await asyncio.wait_for(queue.get(), remaining)
+            except asyncio.TimeoutError:
+                raise TimeoutError(f"Build did not finish within {timeout}s") from None
+            if event is done:
+                break
+            yield event
+        result = future.result()
+        yield BuildEvent("build_completed", result=result, partial_path=saved[0] if saved else None)
+    finally:
+        # Covers timeouts, task cancellation and consumers that stop iterating early.
+        cancelled.set()
+        future.cancel()  # only succeeds if the build has not started yet
+
 # =============================================================================
 # 🚀 MAIN
 # =============================================================================
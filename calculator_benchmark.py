@@ -0,0 +1,48 @@
+"""
+🧮 CALCULATOR BENCHMARK
+=======================
+Micro-benchmark of expression.evaluate against Python's eval() on typical
+calculator input: the first press of "=" (parse + evaluate) and repeated
+presses on the same expression (cached parse).
+
+Usage:
+  python calculator_benchmark.py
+  python calculator_benchmark.py --number 100000
+"""
+
+import argparse
+import sys
+import timeit
+import expression
+
+EXPRESSIONS = [
+    "7+8",
+    "12*4-6/3",
+    "1.5*(2+3.25)-4/8",
+    "-(3+4)*(5-2)/7+100",
+    "((1+2)*(3+4)-(5*6))/(7-8+9)*10",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the calculator's evaluator against eval()")
+    parser.add_argument("--number", type=int, default=20000, help="evaluations per measurement")
+    args = parser.parse_args()
+
+    print(f"{'expression':<34} {'eval':>10} {'parse+eval':>12} {'cached':>10}")
+    for text in EXPRESSIONS:
+        assert abs(expression.evaluate(text) - eval(text)) < 1e-9, text
+        with_eval = timeit.timeit(lambda: eval(text), number=args.number)
+
+        def uncached():
+            expression.parse.cache_clear()
+            return expression.evaluate(text)
+        cold = timeit.timeit(uncached, number=args.number)
+        warm = timeit.timeit(lambda: expression.evaluate(text), number=args.number)
+        per_call = lambda seconds: f"{seconds / args.number * 1e6:.2f}µs"
+        print(f"{text:<34} {per_call(with_eval):>10} {per_call(cold):>12} {per_call(warm):>10}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
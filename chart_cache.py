@@ -0,0 +1,103 @@
+"""
+Memoized chart data for the dashboard.
+
+Every widget interaction reruns app.py from the top. The processed metric
+frame and the downsampled price bars are kept here, keyed by ticker,
+timeframe and chart plus a fingerprint of the data they were built from,
+so a rerun that only toggles a widget skips the processing. The
+st.line_chart / st.bar_chart calls still build their specs from these
+frames on every rerun. Memory is bounded by an estimate of entry sizes,
+evicting the least recently used entries first.
+"""
+
+import os
+import sys
+import threading
+from collections import OrderedDict
+import pandas as pd
+
+CHART_CACHE_BYTES = int(os.getenv("CHART_CACHE_MB", "256")) * 1024 * 1024
+
+
+def sizeof(value):
+    """Rough in-memory size of a cached value."""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum() if isinstance(usage, pd.Series) else usage)
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(sizeof(v) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(sizeof(v) for v in value.values())
+    return sys.getsizeof(value)
+
+
+def fingerprint(*frames):
+    """Cheap content hash of the frames a chart is built from."""
+    parts = []
+    for frame in frames:
+        if frame is None or len(frame) == 0:
+            parts.append(0)
+        else:
+            parts.append(int(pd.util.hash_pandas_object(frame, index=True).sum()))
+    return tuple(parts)
+
+
+class ChartCache:
+    def __init__(self, max_bytes=CHART_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (value, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, key, build):
+        """Returns the cached value for `key`, calling `build()` on a miss."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            self.misses += 1
+
+        # Built outside the lock; two sessions racing on one key just both build it.
+        value = build()
+        size = sizeof(value)
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            if size <= self.max_bytes:
+                self._entries[key] = (value, size)
+                self._bytes += size
+                while self._bytes > self.max_bytes:
+                    _, (_, evicted) = self._entries.popitem(last=False)
+                    self._bytes -= evicted
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+def shared():
+    """The process-wide cache every dashboard session draws from."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = ChartCache()
+        return _shared
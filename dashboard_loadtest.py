@@ -0,0 +1,187 @@
+"""
+📈 DASHBOARD LOAD TEST
+======================
+Drives N simulated analyst sessions through app.py with Streamlit's AppTest,
+against the local yfinance stand-in (fake_yfinance.py) instead of Yahoo.
+Every session opens the dashboard and then changes tickers, flips the
+quarterly/annual toggle, the history window and the metric selection.
+
+Reports rerun latency (p50/p95/p99, overall and per interaction), traced
+memory per session, chart/statement cache hit rates and how many requests
+would have gone to Yahoo. Each run starts from an empty statement store
+and shared cache unless FIN_STORE_DIR / SHM_CACHE_DIR are set.
+
+Usage:
+  python dashboard_loadtest.py                          # 20 sessions, 8 at a time
+  python dashboard_loadtest.py --sessions 100 --concurrency 25 --latency 0.5
+  python dashboard_loadtest.py --output benchmarks/dashboard.json
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+# Must be set before the dashboard modules read them.
+os.environ.setdefault("FIN_STORE_DIR", tempfile.mkdtemp(prefix="dashboard-loadtest-"))
+os.environ.setdefault("SHM_CACHE_DIR", tempfile.mkdtemp(prefix="dashboard-loadtest-shm-"))
+
+from streamlit.testing.v1 import AppTest
+import chart_cache
+import fake_yfinance
+import market_data
+import shared_cache
+from price_history import TIMEFRAMES
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+DEFAULT_TICKERS = ["AAPL", "MSFT", "GOOGL", "AMZN", "META", "NVDA", "TSLA", "JPM", "V", "WMT"]
+METRIC_OPTIONS = ["Price", "Revenue", "Margins", "Debt", "Valuation", "Buybacks"]
+
+# =============================================================================
+# 🎬 INTERACTIONS
+# =============================================================================
+# Widget order follows app.py's sidebar in single-ticker mode:
+# radio[0] Mode, text_input[0] ticker, radio[1] Timeframe, multiselect[0] metrics, selectbox[0] History
+
+def change_ticker(at, rng, tickers):
+    at.text_input[0].set_value(rng.choice(tickers))
+
+def toggle_frequency(at, rng, tickers):
+    frequency = at.radio[1]
+    frequency.set_value("Annual" if frequency.value == "Quarterly" else "Quarterly")
+
+def change_window(at, rng, tickers):
+    at.selectbox[0].set_value(rng.choice(list(TIMEFRAMES)))
+
+def toggle_metric(at, rng, tickers):
+    selected = set(at.multiselect[0].value)
+    selected ^= {rng.choice(METRIC_OPTIONS)}
+    at.multiselect[0].set_value([m for m in METRIC_OPTIONS if m in selected])
+
+INTERACTIONS = {
+    'ticker': change_ticker,
+    'frequency': toggle_frequency,
+    'window': change_window,
+    'metrics': toggle_metric,
+}
+
+
+# =============================================================================
+# 🏃 SESSIONS
+# =============================================================================
+
+def run_session(index, tickers, interactions, seed):
+    """One simulated analyst. Returns (AppTest, [(interaction, seconds, error)])."""
+    rng = random.Random(seed + index)
+    at = AppTest.from_file(APP_PATH, default_timeout=120)
+    timings = []
+
+    def timed(name):
+        started = time.perf_counter()
+        at.run()
+        timings.append((name, time.perf_counter() - started, bool(at.exception)))
+
+    timed('open')
+    for _ in range(interactions):
+        name = rng.choice(list(INTERACTIONS))
+        INTERACTIONS[name](at, rng, tickers)
+        timed(name)
+    return at, timings
+
+
+def percentiles(samples):
+    if len(samples) < 2:
+        value = samples[0] if samples else 0.0
+        return {'p50': value, 'p95': value, 'p99': value}
+    cuts = statistics.quantiles(samples, n=100, method='inclusive')
+    return {'p50': cuts[49], 'p95': cuts[94], 'p99': cuts[98]}
+
+
+def report(timings, sessions, memory_bytes, elapsed):
+    by_interaction = {}
+    for name, seconds, _ in timings:
+        by_interaction.setdefault(name, []).append(seconds)
+    return {
+        'sessions': sessions,
+        'reruns': len(timings),
+        'errors': sum(error for _, _, error in timings),
+        'seconds': round(elapsed, 2),
+        'latency': {k: round(v, 4) for k, v in percentiles([s for _, s, _ in timings]).items()},
+        'latency_by_interaction': {
+            name: {k: round(v, 4) for k, v in percentiles(samples).items()}
+            for name, samples in sorted(by_interaction.items())
+        },
+        'memory_per_session_kb': round(memory_bytes / sessions / 1024, 1) if memory_bytes else None,
+        'chart_cache': chart_cache.shared().stats(),
+        'shared_cache': shared_cache.shared().stats(),
+        'statement_store': market_data.cache_stats(),
+        'yahoo_requests': dict(fake_yfinance.request_counts),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the Streamlit dashboard")
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=8, help="sessions running at the same time")
+    parser.add_argument("--interactions", type=int, default=10, help="widget changes per session")
+    parser.add_argument("--tickers", nargs="+", default=DEFAULT_TICKERS)
+    parser.add_argument("--latency", type=float, default=fake_yfinance.LATENCY,
+                        help="simulated Yahoo round trip in seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true", help="skip tracemalloc (it slows every rerun)")
+    parser.add_argument("--output", help="also write the report as JSON")
+    args = parser.parse_args()
+
+    print(f"🧪 {args.sessions} sessions x {args.interactions} interactions, "
+          f"{args.concurrency} concurrent, {args.latency}s simulated latency")
+    print(f"📂 Statement store: {os.environ['FIN_STORE_DIR']}")
+
+    if not args.no_memory:
+        tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+
+    started = time.perf_counter()
+    with fake_yfinance.installed(latency=args.latency):
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            results = list(pool.map(
+                lambda i: run_session(i, args.tickers, args.interactions, args.seed),
+                range(args.sessions)
+            ))
+    elapsed = time.perf_counter() - started
+
+    # Sessions are still referenced here, so their state counts towards the total.
+    memory = tracemalloc.get_traced_memory()[0] - baseline if tracemalloc.is_tracing() else 0
+    tracemalloc.stop()
+    timings = [t for _, session_timings in results for t in session_timings]
+    result = report(timings, args.sessions, memory, elapsed)
+
+    latency = result['latency']
+    print(f"\n⏱️  Rerun latency: p50 {latency['p50']*1000:.0f}ms  "
+          f"p95 {latency['p95']*1000:.0f}ms  p99 {latency['p99']*1000:.0f}ms  "
+          f"({result['reruns']} reruns in {result['seconds']}s, {result['errors']} errors)")
+    for name, stats in result['latency_by_interaction'].items():
+        print(f"   {name:<10} p50 {stats['p50']*1000:>7.0f}ms  p95 {stats['p95']*1000:>7.0f}ms  "
+              f"p99 {stats['p99']*1000:>7.0f}ms")
+    if result['memory_per_session_kb'] is not None:
+        print(f"🧠 Memory per session: {result['memory_per_session_kb']} KB")
+    print(f"🗃️  Chart cache hit rate: {result['chart_cache']['hit_rate']:.0%}  "
+          f"Shared cache: {result['shared_cache']['hit_rate']:.0%}  "
+          f"Statement store: {result['statement_store']['hit_rate']:.0%}")
+    print(f"🌐 Yahoo requests: {sum(result['yahoo_requests'].values())} {result['yahoo_requests']}")
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+        print(f"💾 Report written: {args.output}")
+    return 1 if result['errors'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,327 @@
+"""
+Arithmetic expressions for the calculator: tokenizer, Pratt parser and
+evaluator. Replaces eval(): only numbers, + - * /, unary signs and
+parentheses are accepted, and every operation goes through Operations.
+Parsed expressions are cached, and errors carry the position of the
+offending character.
+
+Calculator keeps the same grammar as an incremental shunting-yard state
+that is updated one key press at a time, so the running result is always
+known without re-parsing. Both paths compute in float, decimal (fixed
+number of significant digits) or fraction (exact, with a bounded
+denominator) mode.
+"""
+
+import decimal
+import math
+import re
+from fractions import Fraction
+from functools import lru_cache
+from operations import Operations
+
+TOKEN = re.compile(r'\s*(?:(\d+\.?\d*|\.\d+)|(\S))')
+
+# Binding power of each binary operator (higher binds tighter)
+BINARY = {'+': 10, '-': 10, '*': 20, '/': 20}
+UNARY = 30
+
+_operations = Operations()
+APPLY = {
+    '+': _operations.add,
+    '-': _operations.subtract,
+    '*': _operations.multiply,
+    '/': _operations.divide,
+}
+
+MODES = ('float', 'decimal', 'fraction')
+# Decimal mode: significant digits kept by every operation
+DECIMAL_CONTEXT = decimal.Context(prec=50)
+# Fraction mode: larger denominators are rounded to the closest fraction below this
+# bound, so a long chain of divisions cannot make each step slower than the last
+MAX_DENOMINATOR = 10 ** 50
+
+
+class ExpressionError(ValueError):
+    def __init__(self, message, position):
+        super().__init__(f"{message} at position {position + 1}")
+        self.message = message
+        self.position = position  # 0-based index into the expression text
+
+
+def tokenize(text):
+    """'12+3.5' -> [('num', '12', 0), ('op', '+', 2), ('num', '3.5', 3), ('end', None, 6)]"""
+    tokens = []
+    position = 0
+    for match in TOKEN.finditer(text):
+        number, symbol = match.groups()
+        position = match.start(1) if number else match.start(2)
+        if number:
+            tokens.append(('num', number, position))
+        elif symbol in BINARY or symbol in '()':
+            tokens.append(('op', symbol, position))
+        else:
+            raise ExpressionError(f"Unexpected '{symbol}'", position)
+    tokens.append(('end', None, len(text.rstrip())))
+    return tokens
+
+
+class _Parser:
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.index = 0
+
+    def next(self):
+        token = self.tokens[self.index]
+        self.index += 1
+        return token
+
+    def peek(self):
+        return self.tokens[self.index]
+
+    def expression(self, min_power=0):
+        kind, value, position = self.next()
+        # Prefix position: number, unary sign or parenthesised group
+        if kind == 'num':
+            left = ('num', value, position)
+        elif value in ('+', '-'):
+            operand = self.expression(UNARY)
+            left = operand if value == '+' else ('neg', operand, position)
+        elif value == '(':
+            left = self.expression()
+            closing = self.next()
+            if closing[1] != ')':
+                raise ExpressionError("Missing ')'", closing[2])
+        elif kind == 'end':
+            raise ExpressionError("Unexpected end of expression", position)
+        else:
+            raise ExpressionError(f"Unexpected '{value}'", position)
+
+        # Infix position: keep folding operators that bind tighter than min_power
+        while True:
+            kind, op, position = self.peek()
+            power = BINARY.get(op) if kind == 'op' else None
+            if power is None or power <= min_power:
+                return left
+            self.next()
+            left = ('bin', op, left, self.expression(power), position)
+
+
+@lru_cache(maxsize=256)
+def parse(text):
+    """Parses `text` into a nested-tuple AST (cached per expression text)."""
+    parser = _Parser(tokenize(text))
+    try:
+        tree = parser.expression()
+    except RecursionError:
+        raise ExpressionError("Expression is nested too deeply", 0) from None
+    kind, value, position = parser.peek()
+    if kind != 'end':
+        raise ExpressionError(f"Unexpected '{value}'", position)
+    return tree
+
+
+def _arithmetic_error(error, position):
+    """Maps what Python's number types raise to an ExpressionError at `position`."""
+    if isinstance(error, ZeroDivisionError):
+        return ExpressionError("Cannot divide by zero", position)
+    if isinstance(error, ValueError):
+        return ExpressionError("Number is too long", position)  # int() digit limit
+    return ExpressionError("Result is too large", position)
+
+
+def number(literal, mode='float', position=0):
+    try:
+        if mode == 'decimal':
+            return decimal.Decimal(literal)
+        if mode == 'fraction':
+            return Fraction(literal)
+        value = float(literal) if '.' in literal else int(literal)
+    except (ArithmeticError, ValueError) as e:
+        raise _arithmetic_error(e, position) from None
+    if isinstance(value, float) and not math.isfinite(value):
+        raise ExpressionError("Number is too large", position)
+    return value
+
+
+def apply(op, left, right, position, mode='float'):
+    """One binary operation through Operations, in the given precision mode."""
+    try:
+        if mode == 'decimal':
+            with decimal.localcontext(DECIMAL_CONTEXT):
+                return APPLY[op](left, right)
+        result = APPLY[op](left, right)
+    except (ArithmeticError, ValueError) as e:
+        raise _arithmetic_error(e, position) from None
+    if mode == 'fraction' and result.denominator > MAX_DENOMINATOR:
+        result = result.limit_denominator(MAX_DENOMINATOR)
+    if isinstance(result, float) and not math.isfinite(result):
+        raise ExpressionError("Result is too large", position)
+    return result
+
+
+def evaluate_tree(node, mode='float'):
+    """
+    Post-order walk with an explicit stack: a chain like 1+1+...+1 is a
+    left-deep tree as deep as it is long, too deep for plain recursion.
+    """
+    values = []
+    pending = [(node, False)]  # (node, children already evaluated)
+    while pending:
+        node, ready = pending.pop()
+        kind = node[0]
+        if kind == 'num':
+            values.append(number(node[1], mode, node[2]))
+        elif not ready:
+            pending.append((node, True))
+            children = (node[1],) if kind == 'neg' else (node[3], node[2])  # right pushed first: left runs first
+            pending.extend((child, False) for child in children)
+        elif kind == 'neg':
+            values.append(apply('-', 0, values.pop(), node[2], mode))
+        else:
+            _, op, _, _, position = node
+            right = values.pop()
+            values.append(apply(op, values.pop(), right, position, mode))
+    return values[0]
+
+
+def evaluate(text, mode='float'):
+    """Evaluates an arithmetic expression; raises ExpressionError on bad input."""
+    return evaluate_tree(parse(text), mode)
+
+
+def format_result(value):
+    """
+    Display text that parses back to the same value: plain digits, never an
+    exponent, so the calculator can carry on from a result.
+    """
+    try:
+        if isinstance(value, float):
+            # repr() is the shortest exact form; Decimal spells out its exponent
+            text = format(decimal.Decimal(repr(value)), 'f')
+            return text if '.' in text else f"{text}.0"  # stays a float when parsed back
+        if isinstance(value, decimal.Decimal):
+            return format(value, 'f')
+        if isinstance(value, Fraction):
+            return str(value.numerator) if value.denominator == 1 else f"{value.numerator}/{value.denominator}"
+        return str(value)
+    except ValueError:  # int digit limit
+        raise ExpressionError("Result is too long to show", 0) from None
+
+
+# =============================================================================
+# Incremental evaluation
+# =============================================================================
+
+class Calculator:
+    """
+    Shunting-yard state fed one key at a time. Operators are applied as
+    soon as precedence allows, so the stacks only hold what is still
+    pending (a few entries per open parenthesis) and every key press costs
+    O(1) however long the expression gets. A key that would make the
+    expression invalid raises ExpressionError and leaves the state as it was.
+    """
+
+    def __init__(self, mode='float'):
+        self.mode = mode
+        self.clear()
+
+    def clear(self):
+        self.text = ''
+        self.values = []
+        self.ops = []           # (operator, position); '(' and 'neg' included
+        self.literal = ''       # the number being typed
+        self.expect_operand = True
+
+    def load(self, text):
+        """Replaces the state with `text`, fed through press() key by key."""
+        self.clear()
+        for key in text:
+            if not key.isspace():
+                self.press(key)
+
+    def press(self, key):
+        state = (self.text, self.values[:], self.ops[:], self.literal, self.expect_operand)
+        try:
+            self._press(key)
+        except Exception:
+            self.text, self.values, self.ops, self.literal, self.expect_operand = state
+            raise
+        self.text += key
+
+    def _press(self, key):
+        position = len(self.text)
+        if key.isdigit() or key == '.':
+            if not self.expect_operand and not self.literal:
+                raise ExpressionError(f"Unexpected '{key}'", position)
+            if key == '.' and '.' in self.literal:
+                raise ExpressionError("Unexpected '.'", position)
+            self.literal += key
+            return
+
+        self._finish_number(position)
+        if key == '(':
+            if not self.expect_operand:
+                raise ExpressionError("Unexpected '('", position)
+            self.ops.append(('(', position))
+        elif key == ')':
+            if self.expect_operand:
+                raise ExpressionError("Unexpected ')'", position)
+            while self.ops and self.ops[-1][0] != '(':
+                self._reduce()
+            if not self.ops:
+                raise ExpressionError("Unexpected ')'", position)
+            self.ops.pop()
+        elif key in BINARY:
+            if self.expect_operand:
+                if key == '-':
+                    self.ops.append(('neg', position))
+                elif key != '+':  # a unary plus changes nothing
+                    raise ExpressionError(f"Unexpected '{key}'", position)
+                return
+            while self.ops and self._power(self.ops[-1][0]) >= BINARY[key]:
+                self._reduce()
+            self.ops.append((key, position))
+            self.expect_operand = True
+        else:
+            raise ExpressionError(f"Unexpected '{key}'", position)
+
+    def _power(self, op):
+        return 0 if op == '(' else UNARY if op == 'neg' else BINARY[op]
+
+    def _finish_number(self, position):
+        if not self.literal:
+            return
+        if self.literal == '.':
+            raise ExpressionError("Unexpected '.'", position - 1)
+        self.values.append(number(self.literal, self.mode, position - len(self.literal)))
+        self.literal = ''
+        self.expect_operand = False
+
+    def _reduce(self, values=None, ops=None):
+        values = self.values if values is None else values
+        ops = self.ops if ops is None else ops
+        op, position = ops.pop()
+        if op == 'neg':
+            values.append(apply('-', 0, values.pop(), position, self.mode))
+        else:
+            right = values.pop()
+            values.append(apply(op, values.pop(), right, position, self.mode))
+
+    def result(self):
+        """
+        Value of the expression typed so far; None while it is incomplete
+        (ends in an operator or has an unclosed parenthesis), where
+        evaluate() would report an error.
+        """
+        if any(op == '(' for op, _ in self.ops):
+            return None
+        values, ops = self.values[:], self.ops[:]
+        if self.literal:
+            if self.literal == '.':
+                return None
+            values.append(number(self.literal, self.mode, len(self.text) - len(self.literal)))
+        elif self.expect_operand:
+            return None
+        while ops:
+            self._reduce(values, ops)
+        return values[-1]
@@ -0,0 +1,225 @@
+"""
+Local stand-in for yfinance, used by the dashboard load test.
+
+FakeTicker/download mimic the parts of yfinance the dashboard uses. Data
+comes from recorded fixtures (benchmarks/fixtures/<TICKER>/) when present
+and is otherwise synthesized deterministically from the ticker symbol, so
+any watchlist works offline. Every request sleeps for a configurable
+latency to stand in for Yahoo's round trip, and every request is counted.
+
+Usage:
+  python fake_yfinance.py --record AAPL MSFT   # save real yfinance responses as fixtures
+"""
+
+import argparse
+import json
+import os
+import random
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+import numpy as np
+import pandas as pd
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks", "fixtures")
+
+# Simulated Yahoo round trip: mean and +/- jitter, in seconds.
+LATENCY = float(os.getenv("FAKE_YF_LATENCY", "0.3"))
+JITTER = float(os.getenv("FAKE_YF_JITTER", "0.1"))
+
+STATEMENT_ATTRIBUTES = ['financials', 'quarterly_financials', 'balance_sheet',
+                        'quarterly_balance_sheet', 'cashflow', 'quarterly_cashflow']
+
+# Line items synthesized for each statement, as fractions of revenue.
+SYNTHETIC_ITEMS = {
+    'income': {
+        'Total Revenue': 1.0, 'Gross Profit': 0.42, 'Operating Income': 0.28,
+        'Pretax Income': 0.27, 'Tax Provision': 0.04, 'Net Income': 0.23,
+    },
+    'balance': {
+        'Total Debt': 0.3, 'Long Term Debt': 0.25, 'Cash And Cash Equivalents': 0.15,
+        'Stockholders Equity': 0.2,
+    },
+    'cashflow': {
+        'Operating Cash Flow': 0.3, 'Capital Expenditure': -0.03, 'Free Cash Flow': 0.27,
+    },
+}
+
+request_counts = {}  # attribute -> count
+_requests_lock = threading.Lock()
+
+
+def _count(attribute):
+    with _requests_lock:
+        request_counts[attribute] = request_counts.get(attribute, 0) + 1
+
+
+def _sleep():
+    time.sleep(max(0.0, LATENCY + random.uniform(-JITTER, JITTER)))
+
+
+def _rng(ticker, salt=""):
+    return np.random.default_rng(zlib.crc32(f"{ticker}{salt}".encode()))
+
+
+# =============================================================================
+# Synthetic data
+# =============================================================================
+
+def synthetic_statement(ticker, attribute):
+    quarterly = attribute.startswith('quarterly_')
+    statement = {'financials': 'income', 'balance_sheet': 'balance',
+                 'cashflow': 'cashflow'}[attribute.replace('quarterly_', '')]
+    rng = _rng(ticker, attribute)
+    periods = pd.date_range(end=pd.Timestamp.today().normalize() - pd.DateOffset(months=2),
+                            periods=5 if quarterly else 4,
+                            freq=pd.offsets.QuarterEnd() if quarterly else pd.offsets.YearEnd())[::-1]
+    revenue = rng.uniform(1e9, 4e11) / (4 if quarterly else 1)
+    growth = rng.normal(1.0, 0.08, len(periods)).cumprod()
+    frame = pd.DataFrame(
+        {period: {item: share * revenue / g for item, share in SYNTHETIC_ITEMS[statement].items()}
+         for period, g in zip(periods, growth)}
+    )
+    if statement == 'income':
+        frame.loc['Diluted EPS'] = frame.loc['Net Income'] / 1e9
+    if statement == 'balance':
+        frame.loc['Ordinary Shares Number'] = 1e9 * growth[::-1]
+    return frame
+
+
+def synthetic_info(ticker):
+    rng = _rng(ticker, 'info')
+    return {
+        'symbol': ticker, 'shortName': f"{ticker} Inc.",
+        'trailingPE': round(float(rng.uniform(8, 60)), 2),
+        'marketCap': int(rng.uniform(1e9, 3e12)),
+        'debtToEquity': round(float(rng.uniform(0, 250)), 2),
+        'currentPrice': round(float(rng.uniform(5, 900)), 2),
+    }
+
+
+def synthetic_history(ticker):
+    rng = _rng(ticker, 'history')
+    index = pd.bdate_range("2000-01-03", pd.Timestamp.today().normalize(), tz="America/New_York")
+    close = 20 * np.exp(np.cumsum(rng.normal(0.0003, 0.02, len(index))))
+    spread = close * rng.uniform(0.002, 0.02, len(index))
+    return pd.DataFrame({
+        'Open': close + rng.uniform(-1, 1, len(index)) * spread,
+        'High': close + spread,
+        'Low': close - spread,
+        'Close': close,
+        'Volume': rng.integers(1_000_000, 50_000_000, len(index)),
+        'Dividends': 0.0,
+        'Stock Splits': 0.0,
+    }, index=index.rename('Date'))
+
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+def _fixture_path(ticker, name):
+    return os.path.join(FIXTURES_DIR, ticker.upper(), name)
+
+
+def _load_fixture(ticker, attribute):
+    if attribute == 'info':
+        path = _fixture_path(ticker, 'info.json')
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+        return None
+    path = _fixture_path(ticker, f"{attribute}.parquet")
+    if not os.path.exists(path):
+        return None
+    frame = pd.read_parquet(path)
+    return frame if attribute == 'history' else frame.T  # statements are stored transposed
+
+
+def record_fixtures(tickers):
+    """Saves real yfinance responses for `tickers` under FIXTURES_DIR."""
+    import yfinance as yf
+    for ticker in tickers:
+        stock = yf.Ticker(ticker)
+        os.makedirs(_fixture_path(ticker, ''), exist_ok=True)
+        for attribute in STATEMENT_ATTRIBUTES:
+            frame = getattr(stock, attribute)
+            # Parquet needs string column names, and periods are Timestamps.
+            frame.T.to_parquet(_fixture_path(ticker, f"{attribute}.parquet"))
+        stock.history(period="max").to_parquet(_fixture_path(ticker, "history.parquet"))
+        with open(_fixture_path(ticker, 'info.json'), 'w', encoding='utf-8') as f:
+            json.dump(stock.info, f, default=str)
+        print(f"💾 {ticker}")
+
+
+# =============================================================================
+# yfinance API
+# =============================================================================
+
+class FakeTicker:
+    def __init__(self, ticker):
+        self.ticker = ticker.upper()
+
+    def _get(self, attribute):
+        _count(attribute)
+        _sleep()
+        fixture = _load_fixture(self.ticker, attribute)
+        if fixture is not None:
+            return fixture
+        if attribute == 'info':
+            return synthetic_info(self.ticker)
+        return synthetic_statement(self.ticker, attribute)
+
+    def __getattr__(self, attribute):
+        if attribute in STATEMENT_ATTRIBUTES or attribute == 'info':
+            return self._get(attribute)
+        raise AttributeError(attribute)
+
+    def history(self, period="max", start=None, auto_adjust=True, **kwargs):
+        _count('history')
+        _sleep()
+        history = _load_fixture(self.ticker, 'history')
+        if history is None:
+            history = synthetic_history(self.ticker)
+        if start is not None:
+            history = history[history.index.date >= pd.Timestamp(start).date()]
+        elif period != "max":  # "1y", "5y", ...
+            history = history.loc[history.index[-1] - pd.DateOffset(years=int(period.rstrip('y'))):]
+        return history
+
+
+def download(tickers, period="1y", **kwargs):
+    """Batched close prices: one simulated round trip for the whole batch."""
+    _count('download')
+    _sleep()
+    tickers = [tickers] if isinstance(tickers, str) else list(tickers)
+    frames = {}
+    for ticker in tickers:
+        history = _load_fixture(ticker, 'history')
+        if history is None:
+            history = synthetic_history(ticker.upper())
+        frames[ticker] = history.iloc[-252:][['Open', 'High', 'Low', 'Close', 'Volume']]
+    prices = pd.concat(frames, axis=1)
+    return prices.swaplevel(axis=1).sort_index(axis=1)
+
+
+@contextmanager
+def installed(latency=None, jitter=None):
+    """Points yfinance.Ticker/download at the stand-in for the duration of the block."""
+    global LATENCY, JITTER
+    import yfinance as yf
+    saved = (yf.Ticker, yf.download, LATENCY, JITTER)
+    yf.Ticker, yf.download = FakeTicker, download
+    LATENCY = LATENCY if latency is None else latency
+    JITTER = JITTER if jitter is None else jitter
+    try:
+        yield
+    finally:
+        yf.Ticker, yf.download, LATENCY, JITTER = saved
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record yfinance fixtures for the dashboard load test")
+    parser.add_argument("--record", nargs="+", metavar="TICKER", required=True)
+    record_fixtures(parser.parse_args().record)
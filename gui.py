@@ -1,10 +1,12 @@
 import tkinter as tk
 from operations import Operations
+from expression import MODES, Calculator, ExpressionError, evaluate, format_result
 
 class GUI:
     def __init__(self, master):
         self.master = master
         self.operations = Operations()
+        self.calculator = Calculator()
         self.entry_field = tk.Entry(master, width=20)
         self.entry_field.grid(row=0, column=0, columnspan=4)
         self.create_buttons()
@@ -26,17 +28,61 @@ class GUI:
         tk.Button(self.master, text='C', width=5, command=self.clear_entry).grid(row=row_val, column=1)
         tk.Button(self.master, text='=', width=5, command=self.calculate_result).grid(row=row_val, column=2)
         tk.Button(self.master, text='+', width=5, command=lambda: self.click_button('+')).grid(row=row_val, column=3)
+        self.status = tk.Label(self.master, text='')
+        self.status.grid(row=row_val + 1, column=0, columnspan=4)
+        self.mode = tk.StringVar(self.master, value=self.calculator.mode)
+        tk.OptionMenu(self.master, self.mode, *MODES, command=self.change_mode).grid(row=row_val + 2, column=0, columnspan=4)
+    def sync(self):
+        # Typed directly into the entry: rebuild the state from its text
+        if self.calculator.text != self.entry_field.get().replace(' ', ''):
+            self.calculator.load(self.entry_field.get())
+    def show_error(self, error):
+        # Highlight the offending character
+        self.entry_field.icursor(error.position)
+        self.entry_field.selection_range(error.position, error.position + 1)
+        self.status.config(text=str(error), fg='red')
+    def show_running_result(self):
+        result = self.calculator.result()
+        self.status.config(text='' if result is None else f'= {format_result(result)}', fg='gray')
     def click_button(self, button):
-        current = self.entry_field.get()
-        self.entry_field.delete(0, tk.END)
-        self.entry_field.insert(0, str(current) + str(button))
+        try:
+            self.sync()
+            self.calculator.press(button)
+            # Only the new key is appended; the running result needs no re-parse
+            self.entry_field.insert(tk.END, button)
+            self.show_running_result()
+        except ExpressionError as e:
+            self.show_error(e)
+    def change_mode(self, mode):
+        self.calculator = Calculator(mode)
+        self.status.config(text='')
+        try:
+            self.calculator.load(self.entry_field.get())
+            self.show_running_result()
+        except ExpressionError as e:
+            self.show_error(e)
     def clear_entry(self):
         self.entry_field.delete(0, tk.END)
+        self.calculator.clear()
+        self.status.config(text='')
     def calculate_result(self):
         try:
-            result = eval(self.entry_field.get())
+            try:
+                self.sync()
+                result = self.calculator.result()
+            except ExpressionError:
+                result = None
+            if result is None:
+                # Incomplete or invalid input: the full parser reports where
+                result = evaluate(self.entry_field.get(), self.calculator.mode)
+            text = format_result(result)
             self.entry_field.delete(0, tk.END)
-            self.entry_field.insert(0, str(result))
-        except Exception as e:
-            self.entry_field.delete(0, tk.END)
-            self.entry_field.insert(0, 'Error')
\ No newline at end of file
+            self.entry_field.insert(0, text)
+            self.status.config(text='')
+        except ExpressionError as e:
+            self.show_error(e)
+            return
+        try:
+            self.calculator.load(text)  # keep calculating from the result
+        except ExpressionError:
+            self.calculator.clear()  # e.g. a result with more digits than int() accepts
@@ -4,13 +4,23 @@
 Run this script to build ANY software project using AI agents.
 The Project Manager will ask what you want to build and orchestrate the team.
 
-Usage: python main.py
+Usage:
+  python main.py           # the team warms up in the background while you type
+  python main.py --eager   # also let the Project Manager plan while you confirm
 """
 
 import os
-from crewai import Agent, Task, Crew, Process, LLM
+import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from types import SimpleNamespace
+from crewai import Agent, Task, Crew, Process
 from crewai_tools import SerperDevTool, ScrapeWebsiteTool, FileReadTool, FileWriterTool
 from dotenv import load_dotenv
+from brains import (Budget, BudgetExceeded, check_api_key, format_provider_stats, make_brain,
+                    save_partial_results)
+from model_registry import choose
+from transport import format_stats
 
 load_dotenv()
 
@@ -25,138 +35,147 @@ print("="*60 + "\n")
 
 print("🔧 Initializing AI brains...")
 
-# Fast Brain - for quick tasks (Groq - very fast and stable)
-llm_fast = LLM(
-    model="groq/llama-3.3-70b-versatile",
-    api_key=os.getenv("GROQ_API_KEY"),
+# Models come from the cached model registry (MODEL_SMART / MODEL_FAST override it)
+smart_model = choose("smart")
+
+# Fast Brain - for quick tasks (same model, higher temperature)
+llm_fast = make_brain(
+    model=smart_model,
     temperature=0.5
 )
 
-# Smart Brain - for complex tasks (Groq - same but with lower temperature for precision)
-llm_smart = LLM(
-    model="groq/llama-3.3-70b-versatile",
-    api_key=os.getenv("GROQ_API_KEY"),
+# Smart Brain - for complex tasks (lower temperature for precision)
+llm_smart = make_brain(
+    model=smart_model,
     temperature=0.3
 )
 
-print("✅ AI brains ready (Powered by Groq)!\n")
+print(f"✅ AI brains ready (Powered by {smart_model})!\n")
 
 # =============================================================================
-# 🛠️ TOOLS INITIALIZATION
+# 👥 AGENT DEFINITIONS
 # =============================================================================
 
-search_tool = SerperDevTool()
-scrape_tool = ScrapeWebsiteTool()
-file_read_tool = FileReadTool()
-file_write_tool = FileWriterTool()
+# The team is assembled lazily (and only once) so it can be built in the
+# background while the user is still typing their project description.
+_team = None
+_team_lock = threading.Lock()
 
-# =============================================================================
-# 👥 AGENT DEFINITIONS
-# =============================================================================
+def assemble_team():
+    """Creates the tools and the five agents on first use and returns them."""
+    global _team
+    with _team_lock:
+        if _team is not None:
+            return _team
 
-print("👥 Assembling your development team...\n")
+        search_tool = SerperDevTool()
+        scrape_tool = ScrapeWebsiteTool()
+        file_read_tool = FileReadTool()
+        file_write_tool = FileWriterTool()
 
-# 1. PROJECT MANAGER (The Boss) - Takes user input and creates tasks
-project_manager = Agent(
-    role='Project Manager',
-    goal='Understand client requirements and create detailed task specifications for the development team',
-    backstory="""You are a brilliant Project Manager with 15 years of experience leading software teams.
-    You excel at taking vague client ideas and transforming them into crystal-clear, actionable tasks.
-    You know exactly what each team member needs to succeed:
-    - The Product Manager needs clear business requirements
-    - The Architect needs technical constraints and preferences  
-    - The Developer needs specific implementation details
-    - The QA Engineer needs acceptance criteria
+        # 1. PROJECT MANAGER (The Boss) - Takes user input and creates tasks
+        project_manager = Agent(
+            role='Project Manager',
+            goal='Understand client requirements and create detailed task specifications for the development team',
+            backstory="""You are a brilliant Project Manager with 15 years of experience leading software teams.
+            You excel at taking vague client ideas and transforming them into crystal-clear, actionable tasks.
+            You know exactly what each team member needs to succeed:
+            - The Product Manager needs clear business requirements
+            - The Architect needs technical constraints and preferences  
+            - The Developer needs specific implementation details
+            - The QA Engineer needs acceptance criteria
     
-    You create comprehensive task descriptions that leave no room for ambiguity.""",
-    verbose=True,
-    allow_delegation=True,
-    llm=llm_smart
-)
+            You create comprehensive task descriptions that leave no room for ambiguity.""",
+            verbose=True,
+            allow_delegation=True,
+            llm=llm_smart
+        )
 
-# 2. PRODUCT MANAGER - Defines requirements
-product_manager = Agent(
-    role='Product Manager',
-    goal='Transform project vision into detailed product requirements and user stories',
-    backstory="""You are an experienced Product Manager who bridges business needs and technical execution.
-    You create comprehensive PRDs (Product Requirements Documents) that cover:
-    - User experience specifications
-    - Feature requirements with acceptance criteria
-    - Data formatting and display rules
-    - Error handling expectations
-    You ensure the final product delivers real value to users.""",
-    verbose=True,
-    allow_delegation=False,
-    llm=llm_smart
-)
+        # 2. PRODUCT MANAGER - Defines requirements
+        product_manager = Agent(
+            role='Product Manager',
+            goal='Transform project vision into detailed product requirements and user stories',
+            backstory="""You are an experienced Product Manager who bridges business needs and technical execution.
+            You create comprehensive PRDs (Product Requirements Documents) that cover:
+            - User experience specifications
+            - Feature requirements with acceptance criteria
+            - Data formatting and display rules
+            - Error handling expectations
+            You ensure the final product delivers real value to users.""",
+            verbose=True,
+            allow_delegation=False,
+            llm=llm_smart
+        )
 
-# 3. SOFTWARE ARCHITECT - Designs the solution
-architect = Agent(
-    role='Software Architect',
-    goal='Design robust, scalable technical architectures with the best technology choices',
-    backstory="""You are a visionary Software Architect who stays current with the latest technologies.
-    You research frameworks, libraries, and best practices to make data-driven decisions.
-    Your designs include:
-    - Technology stack recommendations
-    - Code structure and patterns
-    - API designs and data flows
-    - Error handling strategies
-    You never guess - you research and validate your choices.""",
-    verbose=True,
-    allow_delegation=False,
-    llm=llm_smart,
-    tools=[search_tool, scrape_tool]
-)
+        # 3. SOFTWARE ARCHITECT - Designs the solution
+        architect = Agent(
+            role='Software Architect',
+            goal='Design robust, scalable technical architectures with the best technology choices',
+            backstory="""You are a visionary Software Architect who stays current with the latest technologies.
+            You research frameworks, libraries, and best practices to make data-driven decisions.
+            Your designs include:
+            - Technology stack recommendations
+            - Code structure and patterns
+            - API designs and data flows
+            - Error handling strategies
+            You never guess - you research and validate your choices.""",
+            verbose=True,
+            allow_delegation=False,
+            llm=llm_smart,
+            tools=[search_tool, scrape_tool]
+        )
 
-# 4. SENIOR DEVELOPER - Writes the code
-senior_developer = Agent(
-    role='Senior Developer',
-    goal='Write production-quality, clean, and efficient code that implements the specifications exactly',
-    backstory="""You are a Senior Developer with expertise in Python, web development, and modern frameworks.
-    You write code that is:
-    - Clean and readable
-    - Well-documented
-    - Properly error-handled
-    - Following best practices
-    You use the FileWriterTool to save your code to actual files.
-    You NEVER use deprecated or basic functions when better alternatives exist.""",
-    verbose=True,
-    allow_delegation=False,
-    llm=llm_smart,  # Changed to smart brain for better code quality
-    tools=[file_read_tool, file_write_tool]
-)
+        # 4. SENIOR DEVELOPER - Writes the code
+        senior_developer = Agent(
+            role='Senior Developer',
+            goal='Write production-quality, clean, and efficient code that implements the specifications exactly',
+            backstory="""You are a Senior Developer with expertise in Python, web development, and modern frameworks.
+            You write code that is:
+            - Clean and readable
+            - Well-documented
+            - Properly error-handled
+            - Following best practices
+            You use the FileWriterTool to save your code to actual files.
+            You NEVER use deprecated or basic functions when better alternatives exist.""",
+            verbose=True,
+            allow_delegation=False,
+            llm=llm_smart,  # Changed to smart brain for better code quality
+            tools=[file_read_tool, file_write_tool]
+        )
 
-# 5. QA ENGINEER - Validates the output
-qa_engineer = Agent(
-    role='QA Engineer',
-    goal='Ensure all code meets quality standards and requirements before delivery',
-    backstory="""You are a meticulous QA Engineer who catches issues others miss.
-    You verify:
-    - Code follows the specifications
-    - No forbidden patterns are used
-    - Error handling is implemented
-    - The code will actually run
-    You create detailed QA reports and don't approve anything that's not production-ready.""",
-    verbose=True,
-    allow_delegation=False,
-    llm=llm_smart,
-    tools=[file_read_tool]
-)
+        # 5. QA ENGINEER - Validates the output
+        qa_engineer = Agent(
+            role='QA Engineer',
+            goal='Ensure all code meets quality standards and requirements before delivery',
+            backstory="""You are a meticulous QA Engineer who catches issues others miss.
+            You verify:
+            - Code follows the specifications
+            - No forbidden patterns are used
+            - Error handling is implemented
+            - The code will actually run
+            You create detailed QA reports and don't approve anything that's not production-ready.""",
+            verbose=True,
+            allow_delegation=False,
+            llm=llm_smart,
+            tools=[file_read_tool]
+        )
 
-print("✅ Team assembled: Project Manager, Product Manager, Architect, Developer, QA Engineer\n")
+        _team = SimpleNamespace(
+            project_manager=project_manager,
+            product_manager=product_manager,
+            architect=architect,
+            senior_developer=senior_developer,
+            qa_engineer=qa_engineer
+        )
+        return _team
 
 # =============================================================================
 # 🎯 DYNAMIC TASK GENERATION
 # =============================================================================
 
-def create_tasks_for_project(project_description: str):
-    """
-    Creates dynamic tasks based on the user's project description.
-    The Project Manager analyzes the request and generates specific tasks for each team member.
-    """
-    
-    # Task 0: Project Manager analyzes the request and creates a project plan
-    task_project_planning = Task(
+def create_planning_task(project_description: str):
+    """Task 0: the Project Manager analyzes the request and creates a project plan."""
+    return Task(
         description=f"""
         A client has requested the following project:
         
@@ -188,8 +207,29 @@ def create_tasks_for_project(project_description: str):
         Be specific and actionable. The team will use your plan to execute the project.
         """,
         expected_output="A comprehensive project plan with specific instructions for each team member",
-        agent=project_manager
+        agent=assemble_team().project_manager
     )
+
+def create_tasks_for_project(project_description: str, plan: str = None):
+    """
+    Creates dynamic tasks based on the user's project description.
+    The Project Manager analyzes the request and generates specific tasks for each team member.
+    If the Project Manager already produced `plan` (eager planning), the planning
+    task is skipped and the plan is handed to the Product Manager directly.
+    """
+    team = assemble_team()
+    product_manager = team.product_manager
+    architect = team.architect
+    senior_developer = team.senior_developer
+    qa_engineer = team.qa_engineer
+    
+    plan_section = ""
+    if plan:
+        plan_section = f"""
+        === PROJECT MANAGER'S PLAN ===
+        {plan}
+        === END PLAN ===
+        """
     
     # Task 1: Product Manager creates requirements
     task_requirements = Task(
@@ -198,7 +238,7 @@ def create_tasks_for_project(project_description: str):
         
         Original client request for context:
         {project_description}
-        
+        {plan_section}
         Your PRD must include:
         
         1. **USER EXPERIENCE REQUIREMENTS**
@@ -351,15 +391,63 @@ def create_tasks_for_project(project_description: str):
         agent=qa_engineer
     )
     
-    return [task_project_planning, task_requirements, task_architecture, task_development, task_qa]
+    tasks = [task_requirements, task_architecture, task_development, task_qa]
+    if plan:
+        return tasks
+    return [create_planning_task(project_description)] + tasks
 
 # =============================================================================
 # 🚀 MAIN EXECUTION
 # =============================================================================
 
+def prewarm(executor):
+    """
+    Starts the slow, input-independent setup in the background so it overlaps
+    with the user typing: assembling the agents and checking the API key (which
+    also opens the first pooled connection to the model's provider, see transport.py).
+    """
+    return {
+        "team": executor.submit(assemble_team),
+        "api_key": executor.submit(check_api_key),
+    }
+
+def plan_project(project_description: str, budget: Budget):
+    """Runs the Project Manager's planning task on its own and returns the plan."""
+    project_manager = assemble_team().project_manager
+    task = create_planning_task(project_description)
+    project_manager.verbose = False  # don't print over the confirmation prompt
+    try:
+        with budget.activate():
+            plan = project_manager.execute_task(task)
+        budget.task_done()
+        return plan
+    finally:
+        project_manager.verbose = True
+
+def in_background(fn, *args):
+    """
+    Runs fn on a daemon thread and returns a Future for its result. Unlike
+    executor threads, an abandoned run does not keep the process alive at exit.
+    """
+    future = Future()
+
+    def run():
+        future.set_running_or_notify_cancel()
+        try:
+            future.set_result(fn(*args))
+        except BaseException as e:
+            future.set_exception(e)
+    threading.Thread(target=run, daemon=True, name="planning").start()
+    return future
+
 def main():
     """Main function to run the Agentic Software House."""
     
+    # Opt-in: let the Project Manager start planning while you confirm
+    eager_planning = "--eager" in sys.argv or os.getenv("INTAKE_EAGER_PLANNING") == "1"
+    executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="prewarm")
+    warmup = prewarm(executor)
+    
     print("="*60)
     print("💬 WHAT WOULD YOU LIKE TO BUILD?")
     print("="*60)
@@ -388,17 +476,29 @@ def main():
     
     if not project_description:
         print("\n❌ No project description provided. Exiting.")
+        executor.shutdown(wait=False)
         return
     
+    budget = Budget.from_env()
+    planning = None
+    if eager_planning:
+        planning = in_background(plan_project, project_description, budget)
+    
     print("\n" + "="*60)
     print("📋 PROJECT RECEIVED")
     print("="*60)
     print(f"\n{project_description}\n")
     
+    key_problem = warmup["api_key"].result()
+    if key_problem:
+        print(f"⚠️  {key_problem} - the build will probably fail.\n")
+    
     # Confirm with user
     confirm = input("🚀 Start building? (yes/no): ").strip().lower()
     if confirm not in ['yes', 'y', 'כן']:
         print("\n❌ Build cancelled.")
+        budget.cancel()  # early planning stops at its next LLM call
+        executor.shutdown(wait=False, cancel_futures=True)
         return
     
     print("\n" + "="*60)
@@ -407,20 +507,34 @@ def main():
     print("\nYour AI team is now working on your project...")
     print("This may take several minutes depending on complexity.\n")
     
+    team = warmup["team"].result()
+    print("✅ Team assembled: Project Manager, Product Manager, Architect, Developer, QA Engineer\n")
+    plan = None
+    if planning is not None:
+        try:
+            plan = planning.result()
+            print("📝 Project plan ready (prepared while you confirmed).\n")
+        except Exception as e:
+            print(f"⚠️  Early planning failed ({e}) - the Project Manager will plan again.\n")
+    executor.shutdown(wait=False)
+    
     # Create dynamic tasks based on user input
-    tasks = create_tasks_for_project(project_description)
+    tasks = create_tasks_for_project(project_description, plan=plan)
     
     # Assemble the crew
     crew = Crew(
-        agents=[project_manager, product_manager, architect, senior_developer, qa_engineer],
+        agents=[team.project_manager, team.product_manager, team.architect,
+                team.senior_developer, team.qa_engineer],
         tasks=tasks,
         verbose=True,
-        process=Process.sequential
+        process=Process.sequential,
+        task_callback=budget.task_done
     )
     
     # Execute!
     try:
-        result = crew.kickoff()
+        with budget.activate():
+            result = crew.kickoff()
         
         print("\n" + "="*60)
         print("🎉 PROJECT COMPLETE!")
@@ -431,6 +545,16 @@ def main():
         print("-"*60)
         print("\n✅ Your project has been built!")
         print("📁 Check your project folder for the generated files.")
+        print(f"🌐 Connections: {format_stats()}")
+        print(f"🛟 Providers: {format_provider_stats()}")
+        
+    except BudgetExceeded as e:
+        path = save_partial_results(tasks, e)
+        print("\n" + "="*60)
+        print("⛔ BUILD STOPPED - BUDGET EXCEEDED")
+        print("="*60)
+        print(f"\n{e}\nUsage: {e.usage}")
+        print(f"📄 Partial results saved to {path}")
         
     except Exception as e:
         print("\n" + "="*60)
@@ -0,0 +1,102 @@
+"""
+yfinance access for the dashboard, backed by the local statement store.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+import yfinance as yf
+from statement_store import default_store
+
+# raw_data key -> (period, statement, yf.Ticker attribute)
+STATEMENTS = {
+    'income_stmt': ('annual', 'income_stmt', 'financials'),
+    'balance_sheet': ('annual', 'balance_sheet', 'balance_sheet'),
+    'cash_flow': ('annual', 'cash_flow', 'cashflow'),
+    'quarterly_income_stmt': ('quarterly', 'income_stmt', 'quarterly_financials'),
+    'quarterly_balance_sheet': ('quarterly', 'balance_sheet', 'quarterly_balance_sheet'),
+    'quarterly_cash_flow': ('quarterly', 'cash_flow', 'quarterly_cashflow'),
+}
+
+# How long a page load waits for Yahoo before going on with what it has.
+FETCH_TIMEOUT = float(os.getenv("FETCH_TIMEOUT_SECONDS", "15"))
+
+# Long-lived pool: leaving a `with` block would wait for requests that timed out.
+_fetch_pool = ThreadPoolExecutor(max_workers=int(os.getenv("FETCH_WORKERS", "16")),
+                                 thread_name_prefix="yfinance")
+
+# Store hits (served from disk) vs misses (went to Yahoo), counted per statement/info.
+_stats = {'hits': 0, 'misses': 0}
+_stats_lock = threading.Lock()
+
+
+def _count(hits, misses):
+    with _stats_lock:
+        _stats['hits'] += hits
+        _stats['misses'] += misses
+
+
+def cache_stats():
+    with _stats_lock:
+        lookups = _stats['hits'] + _stats['misses']
+        return {**_stats, 'hit_rate': _stats['hits'] / lookups if lookups else 0.0}
+
+
+def _fetch(ticker, attribute):
+    # A Ticker per request, so concurrent requests never share lazy yfinance state.
+    return getattr(yf.Ticker(ticker), attribute)
+
+
+def load_data(ticker, store=None, timeout=FETCH_TIMEOUT, keys=None, now=None):
+    """
+    Returns the statements and info for `ticker`, going to Yahoo only for
+    the statements in `keys` (default: all) and the info when the local store
+    does not have them or they are due for a refresh (as of `now`; a time in
+    the future refreshes what is about to expire).
+
+    data['statements'] is the ticker's long-format statement table; use
+    statement_table.view() to get one statement in yfinance layout.
+
+    Those requests run concurrently, so a cold load takes about as long as the
+    slowest one. Anything that fails or misses `timeout` falls back to the
+    stored copy (if any) and is listed under data['missing'].
+    """
+    store = store or default_store()
+    keys = keys or list(STATEMENTS)
+    pending = {}
+    for key in keys:
+        period, statement, attribute = STATEMENTS[key]
+        if store.needs_refresh(ticker, period, statement, now=now):
+            pending[key] = _fetch_pool.submit(_fetch, ticker, attribute)
+
+    info = store.read_info(ticker, now=now)
+    if info is None:
+        pending['info'] = _fetch_pool.submit(_fetch, ticker, 'info')  # Contains valuation metrics
+    if now is None:  # look-ahead refreshes are not user lookups
+        _count(len(keys) + 1 - len(pending), len(pending))
+
+    wait(pending.values(), timeout=timeout)
+    missing = []
+    fetched_statements = {}
+    for key, future in pending.items():
+        fetched = None
+        if future.done() and future.exception() is None:
+            fetched = future.result()
+        else:
+            # Not marked as checked, so the next load tries Yahoo again.
+            future.cancel()
+            missing.append(key)
+
+        if key == 'info':
+            if fetched is not None:
+                store.write_info(ticker, fetched)
+            info = fetched
+        elif fetched is not None:
+            period, statement, _ = STATEMENTS[key]
+            fetched_statements[(period, statement)] = fetched
+
+    if fetched_statements:
+        table = store.write_statements(ticker, fetched_statements)
+    else:
+        table = store.read_table(ticker)
+    return {'statements': table, 'info': info or {}, 'missing': missing}
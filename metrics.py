@@ -0,0 +1,94 @@
+"""
+Fundamental metrics engine shared by the single-ticker view and the screener.
+
+Metrics are declared as expressions over named statement fields. The
+statements are first aligned into one frame (a row per period - or per
+ticker when screening - and a column per field), then every intermediate
+and metric is evaluated as a vectorized column expression over that frame.
+Intermediates are computed once and reused by every metric that needs them.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Statement fields: name -> (statement, yfinance line items to try in order).
+# The first label present wins; a field with none of them is NaN.
+FIELDS = {
+    'revenue': ('income', ['Total Revenue', 'Operating Revenue']),
+    'gross_profit': ('income', ['Gross Profit']),
+    'operating_income': ('income', ['Operating Income', 'EBIT']),
+    'net_income': ('income', ['Net Income', 'Net Income Common Stockholders']),
+    'pretax_income': ('income', ['Pretax Income']),
+    'tax_provision': ('income', ['Tax Provision']),
+    'diluted_eps': ('income', ['Diluted EPS', 'Basic EPS']),
+    'long_term_debt': ('balance', ['Long Term Debt', 'Total Debt']),
+    'total_debt': ('balance', ['Total Debt', 'Long Term Debt']),
+    'cash': ('balance', ['Cash And Cash Equivalents', 'Cash Cash Equivalents And Short Term Investments']),
+    'equity': ('balance', ['Stockholders Equity', 'Common Stock Equity']),
+    'shares': ('balance', ['Ordinary Shares Number', 'Share Issued', 'Common Stock']),
+    'free_cash_flow': ('cashflow', ['Free Cash Flow']),
+}
+
+# Shared intermediate results, in dependency order.
+INTERMEDIATES = {
+    'tax_rate': 'tax_provision / pretax_income',
+    'nopat': 'operating_income * (1 - tax_rate)',
+    'invested_capital': 'equity + total_debt - cash',
+}
+
+# Dashboard metric -> expression over fields and intermediates.
+METRICS = {
+    'Revenue': 'revenue',
+    'Gross Margin': 'gross_profit / revenue',
+    'Operating Margin': 'operating_income / revenue',
+    'Net Margin': 'net_income / revenue',
+    'Total Debt': 'long_term_debt',
+    'Shares Outstanding': 'shares',
+    'EPS': 'diluted_eps',
+    'Free Cash Flow': 'free_cash_flow',
+    'ROE': 'net_income / equity',
+    'ROIC': 'nopat / invested_capital',
+}
+
+
+def align_statements(income, balance, cashflow=None):
+    """
+    One frame with a row per statement column (period or ticker) and a column
+    per field. Missing statements and line items become NaN columns.
+    """
+    statements = {
+        'income': income,
+        'balance': balance,
+        'cashflow': cashflow if cashflow is not None else pd.DataFrame(),
+    }
+    index = pd.Index([])
+    for frame in statements.values():
+        index = index.union(frame.columns)
+
+    fields = {}
+    for name, (statement, labels) in FIELDS.items():
+        frame = statements[statement]
+        label = next((l for l in labels if l in frame.index), None)
+        fields[name] = frame.loc[label] if label is not None else np.nan
+    aligned = pd.DataFrame(fields, index=index)
+    return aligned.apply(pd.to_numeric, errors='coerce')
+
+
+def compute_metrics(income, balance, cashflow=None, metrics=None):
+    """
+    Computes `metrics` (default: all of METRICS) for every column of the
+    statements: periods when charting one ticker, tickers when screening.
+    """
+    frame = align_statements(income, balance, cashflow)
+    if not frame.empty:
+        program = "\n".join(f"{name} = {expr}" for name, expr in INTERMEDIATES.items())
+        frame = frame.eval(program)
+
+    names = metrics or list(METRICS)
+    result = pd.DataFrame(
+        {name: frame.eval(METRICS[name]) if not frame.empty else pd.Series(dtype=float)
+         for name in names},
+        index=frame.index
+    )
+    # x / 0 is "no meaningful value", not infinity
+    return result.replace([np.inf, -np.inf], np.nan)
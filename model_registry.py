@@ -0,0 +1,298 @@
+"""
+📚 AGENTIC SOFTWARE HOUSE - Model Registry
+==========================================
+Which models exist, what they can do and how to reach them - discovered
+once, cached on disk, and used by make_brain() in build.py, main.py and
+agents.py instead of hard-coded model names.
+
+Discovery asks every provider whose API key is set (Groq, OpenAI,
+Anthropic, Gemini) for its model list through the shared connection pool,
+and records each model's context window, output limit, capabilities and
+any rate limits the provider reports. The result is kept in
+.model_registry.json next to this file for MODEL_REGISTRY_TTL seconds
+(default one day). Startup never waits for discovery: once the cache has
+expired, the old list (or, without one, the built-in defaults below) is
+used while a background thread rediscovers. test_models.py --refresh
+rediscovers in the foreground.
+
+Models are picked by role:
+  MODEL_SMART / MODEL_FAST   - force a model for the "smart" / "fast" role
+"""
+
+import json
+import os
+import threading
+import time
+import httpx
+import transport
+
+# Read when the registry is used, so values loaded from .env by load_dotenv() apply
+def registry_path():
+    return os.getenv("MODEL_REGISTRY_PATH") or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), ".model_registry.json")
+
+
+def registry_ttl():
+    return float(os.getenv("MODEL_REGISTRY_TTL") or 24 * 3600)
+
+# After a failed discovery, try again this much sooner than the TTL.
+RETRY_SECONDS = 600
+DISCOVERY_TIMEOUT = 5
+
+# provider -> (API key variables, models endpoint)
+PROVIDERS = {
+    "groq": (("GROQ_API_KEY",), "https://api.groq.com/openai/v1/models"),
+    "openai": (("OPENAI_API_KEY",), "https://api.openai.com/v1/models"),
+    "anthropic": (("ANTHROPIC_API_KEY",), "https://api.anthropic.com/v1/models"),
+    "gemini": (("GEMINI_API_KEY", "GOOGLE_API_KEY"), "https://generativelanguage.googleapis.com/v1beta/models"),
+}
+
+# Preferred models per role, best first; the first one that is available wins.
+ROLE_PREFERENCES = {
+    "smart": ["groq/llama-3.3-70b-versatile", "openai/gpt-4o", "anthropic/claude-3-5-sonnet-latest",
+              "gemini/gemini-1.5-pro"],
+    "fast": ["groq/llama-3.1-8b-instant", "openai/gpt-4o-mini", "anthropic/claude-3-5-haiku-latest",
+             "gemini/gemini-1.5-flash"],
+}
+
+# Used until the first successful discovery (or when it is not possible).
+DEFAULT_MODELS = {
+    "groq/llama-3.3-70b-versatile": {"provider": "groq", "context_window": 131072,
+                                     "max_output_tokens": 32768, "capabilities": ["chat"]},
+    "groq/llama-3.1-8b-instant": {"provider": "groq", "context_window": 131072,
+                                  "max_output_tokens": 131072, "capabilities": ["chat"]},
+}
+
+# =============================================================================
+# 🔍 DISCOVERY
+# =============================================================================
+
+def _rate_limits(response):
+    """Rate limits some providers report in response headers (None when absent)."""
+    limits = {
+        "requests": response.headers.get("x-ratelimit-limit-requests"),
+        "tokens": response.headers.get("x-ratelimit-limit-tokens"),
+    }
+    limits = {k: int(v) for k, v in limits.items() if v and v.isdigit()}
+    return limits or None
+
+
+def auth(provider, key):
+    """Request headers and query parameters that authenticate `key` with `provider`."""
+    if provider == "anthropic":
+        return {"x-api-key": key, "anthropic-version": "2023-06-01"}, None
+    if provider == "gemini":
+        return None, {"key": key}
+    return {"Authorization": f"Bearer {key}"}, None
+
+
+def _discover_openai_style(provider, key, url):
+    """Groq and OpenAI share the OpenAI model list format."""
+    headers, _ = auth(provider, key)
+    response = transport.client().get(url, headers=headers, timeout=DISCOVERY_TIMEOUT)
+    response.raise_for_status()
+    limits = _rate_limits(response)
+    models = {}
+    for model in response.json().get("data", []):
+        if model.get("active") is False:
+            continue
+        models[f"{provider}/{model['id']}"] = {
+            "provider": provider,
+            "context_window": model.get("context_window"),
+            "max_output_tokens": model.get("max_completion_tokens"),
+            "capabilities": ["chat"],
+            "rate_limits": limits,
+        }
+    return models
+
+
+def _discover_anthropic(key, url):
+    headers, _ = auth("anthropic", key)
+    response = transport.client().get(url, headers=headers, timeout=DISCOVERY_TIMEOUT)
+    response.raise_for_status()
+    return {
+        f"anthropic/{model['id']}": {"provider": "anthropic", "context_window": None,
+                                     "max_output_tokens": None, "capabilities": ["chat"],
+                                     "rate_limits": _rate_limits(response)}
+        for model in response.json().get("data", [])
+    }
+
+
+def _discover_gemini(key, url):
+    _, params = auth("gemini", key)
+    response = transport.client().get(url, params=params, timeout=DISCOVERY_TIMEOUT)
+    response.raise_for_status()
+    models = {}
+    for model in response.json().get("models", []):
+        methods = model.get("supportedGenerationMethods", [])
+        capabilities = ["chat"] if "generateContent" in methods else []
+        if "embedContent" in methods:
+            capabilities.append("embedding")
+        models[f"gemini/{model['name'].split('/', 1)[-1]}"] = {
+            "provider": "gemini",
+            "context_window": model.get("inputTokenLimit"),
+            "max_output_tokens": model.get("outputTokenLimit"),
+            "capabilities": capabilities,
+            "rate_limits": None,
+        }
+    return models
+
+
+def provider_key(provider):
+    """The provider's API key from the environment, or None."""
+    variables = PROVIDERS.get(provider, ((),))[0]
+    return next((os.getenv(v) for v in variables if os.getenv(v)), None)
+
+
+def discover(provider):
+    """Lists one provider's models. Raises httpx.HTTPError if it cannot be reached."""
+    key = provider_key(provider)
+    url = PROVIDERS[provider][1]
+    if provider == "anthropic":
+        return _discover_anthropic(key, url)
+    if provider == "gemini":
+        return _discover_gemini(key, url)
+    return _discover_openai_style(provider, key, url)
+
+# =============================================================================
+# 📚 REGISTRY
+# =============================================================================
+
+class ModelRegistry:
+    def __init__(self, path=None, ttl=None):
+        self._path = path
+        self._ttl = ttl
+        self._data = None
+        self._refreshing = None  # background refresh thread
+        self._lock = threading.Lock()
+
+    @property
+    def path(self):
+        return self._path or registry_path()
+
+    @property
+    def ttl(self):
+        return self._ttl if self._ttl is not None else registry_ttl()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save(self, data):
+        tmp = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp, self.path)
+
+    def refresh(self):
+        """Discovers every configured provider now and rewrites the cache."""
+        previous = (self._load() or {}).get("models", {})
+        models, errors = {}, {}
+        for provider in PROVIDERS:
+            if not provider_key(provider):
+                continue
+            try:
+                models.update(discover(provider))
+            except (httpx.HTTPError, ValueError, KeyError) as e:
+                errors[provider] = str(e)
+                # Keep what we knew about a provider that could not be reached this time
+                models.update({k: v for k, v in previous.items() if v["provider"] == provider})
+        now = time.time()
+        data = {
+            "discovered_at": now,
+            "expires_at": now + (RETRY_SECONDS if errors else self.ttl),
+            "models": models,
+            "errors": errors,
+        }
+        self._data = data
+        self._save(data)
+        return data
+
+    def data(self):
+        """The cached registry, as is; rediscovers in the background once it has expired."""
+        if self._data is None:
+            self._data = self._load() or {"models": {}, "errors": {}, "expires_at": 0}
+        if time.time() >= self._data.get("expires_at", 0):
+            self._refresh_in_background()
+        return self._data
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._refreshing is not None and self._refreshing.is_alive():
+                return
+            self._refreshing = threading.Thread(target=self._refresh_quietly, daemon=True,
+                                                name="model-registry-refresh")
+            self._refreshing.start()
+
+    def _refresh_quietly(self):
+        try:
+            self.refresh()
+        except Exception:
+            # Cache not writable or an unexpected failure: keep what we have
+            # and try again later rather than on every lookup
+            self._data = {**self._data, "expires_at": time.time() + RETRY_SECONDS}
+
+    def models(self):
+        """model id -> capabilities, context window, output limit and rate limits."""
+        return self.data()["models"] or DEFAULT_MODELS
+
+    def get(self, model):
+        return self.models().get(model)
+
+    def available(self, model):
+        """True when the model is known and its provider's API key is set."""
+        entry = self.get(model)
+        return bool(entry and "chat" in entry["capabilities"] and provider_key(entry["provider"]))
+
+    def choose(self, role):
+        """The model for a role: MODEL_<ROLE> if set, else the first available preference."""
+        forced = os.getenv(f"MODEL_{role.upper()}")
+        if forced:
+            return forced
+        for model in ROLE_PREFERENCES[role]:
+            if self.available(model):
+                return model
+        # Nothing preferred is reachable: the chat model with the largest context window
+        candidates = [m for m in self.models() if self.available(m)]
+        if candidates:
+            return max(candidates, key=lambda m: self.get(m).get("context_window") or 0)
+        return ROLE_PREFERENCES[role][0]
+
+    def alternatives(self, model):
+        """
+        Models from other providers that can stand in for `model`: the best
+        available one per provider from the same role's preferences.
+        """
+        role = next((r for r, models in ROLE_PREFERENCES.items() if model in models), "smart")
+        entry = self.get(model)
+        seen = {entry["provider"] if entry else model.split("/", 1)[0]}
+        alternatives = []
+        for candidate in ROLE_PREFERENCES[role]:
+            provider = candidate.split("/", 1)[0]
+            if provider not in seen and self.available(candidate):
+                alternatives.append(candidate)
+                seen.add(provider)
+        return alternatives
+
+    def provider(self, model):
+        entry = self.get(model)
+        return entry["provider"] if entry else model.split("/", 1)[0]
+
+    def api_key(self, model):
+        return provider_key(self.provider(model))
+
+
+_default_registry = None
+
+def default_registry():
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = ModelRegistry()
+    return _default_registry
+
+
+def choose(role):
+    return default_registry().choose(role)
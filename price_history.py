@@ -0,0 +1,75 @@
+"""
+Price history for the dashboard's price chart.
+
+The full daily history is kept in the statement store and only topped up
+with the newest bars. What goes to the browser is sliced to the selected
+timeframe on the server and aggregated to weekly, monthly or quarterly
+OHLCV bars until it fits a fixed point budget, so the payload stays small
+no matter how long a ticker has been listed. Zooming into a shorter range
+re-slices the daily data and therefore brings back finer bars.
+"""
+
+import pandas as pd
+import yfinance as yf
+from statement_store import default_store
+
+# Sidebar timeframe -> years of history (None = everything)
+TIMEFRAMES = {"Last 5 Years": 5, "Last 10 Years": 10, "Max History": None}
+
+# Upper bound on bars sent to the browser for one chart.
+MAX_POINTS = 1500
+
+OHLCV = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'}
+
+# Coarser and coarser bars, tried in order until the window fits MAX_POINTS.
+RESOLUTIONS = [('Daily', None), ('Weekly', 'W-FRI'), ('Monthly', 'MS'), ('Quarterly', 'QS')]
+
+
+def load_history(ticker, store=None, now=None):
+    """Full daily OHLCV history, fetched once and then only extended with new bars."""
+    store = store or default_store()
+    stored = store.read_prices(ticker)
+    if stored is not None and not store.prices_stale(ticker, now=now):
+        return stored
+
+    stock = yf.Ticker(ticker)
+    if stored is None or stored.empty:
+        history = stock.history(period="max", auto_adjust=True)
+    else:
+        recent = stock.history(start=stored.index[-1].date(), auto_adjust=True)
+        corporate_actions = recent[['Dividends', 'Stock Splits']].abs().sum().sum() if not recent.empty else 0
+        if corporate_actions:
+            # A split or dividend re-adjusts all earlier prices, so start over.
+            history = stock.history(period="max", auto_adjust=True)
+        else:
+            history = pd.concat([stored[~stored.index.isin(recent.index)], recent])
+
+    history = history[list(OHLCV)]
+    store.write_prices(ticker, history)
+    return history
+
+
+def window(history, timeframe="Max History", start=None, end=None):
+    """Slices daily bars to the sidebar timeframe, or to an explicit zoom range."""
+    if history.empty:
+        return history
+    if start is not None or end is not None:
+        return history.loc[start:end]
+    years = TIMEFRAMES[timeframe]
+    if years is None:
+        return history
+    return history.loc[history.index[-1] - pd.DateOffset(years=years):]
+
+
+def downsample(bars, max_points=MAX_POINTS):
+    """Returns (bars, resolution): the finest OHLCV aggregation with at most `max_points` bars."""
+    for resolution, rule in RESOLUTIONS:
+        resampled = bars if rule is None else bars.resample(rule).agg(OHLCV).dropna(subset=['Close'])
+        if len(resampled) <= max_points:
+            return resampled, resolution
+    return resampled, resolution
+
+
+def chart_history(ticker, timeframe="Max History", start=None, end=None, max_points=MAX_POINTS):
+    """The bars to draw for the current view: windowed, then downsampled."""
+    return downsample(window(load_history(ticker), timeframe, start, end), max_points)
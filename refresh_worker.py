@@ -0,0 +1,150 @@
+"""
+Background refresh of the most-viewed tickers.
+
+The dashboard records every ticker it shows. A daemon thread periodically
+takes the most popular ones and refreshes whatever in the statement store
+is about to expire (statements, info, price bars), so by the time a user's
+cache entry runs out the next load is a local disk read rather than a round
+trip to Yahoo. Refreshes run on a small pool behind a global token-bucket
+rate limit, so the worker never competes with users for Yahoo's quota.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+import market_data
+import price_history
+from statement_store import default_store
+
+REFRESH_TOP_N = int(os.getenv("REFRESH_TOP_N", "50"))
+REFRESH_INTERVAL = float(os.getenv("REFRESH_INTERVAL_SECONDS", "300"))
+# Refresh anything that expires within this window (must exceed the interval).
+REFRESH_LEAD = float(os.getenv("REFRESH_LEAD_SECONDS", "900"))
+REFRESH_CONCURRENCY = int(os.getenv("REFRESH_CONCURRENCY", "4"))
+REFRESH_RATE = float(os.getenv("REFRESH_TICKERS_PER_SECOND", "1"))
+
+# Views older than this count for half as much.
+POPULARITY_HALF_LIFE = 24 * 3600
+# Forget a ticker once its decayed score drops below this (about 4 half-lives
+# after a single view), and never track more than MAX_TRACKED tickers.
+MIN_SCORE = 0.05
+MAX_TRACKED = 10000
+
+
+class RateLimiter:
+    """Token bucket: `rate` acquisitions per second, bursts of up to `burst`."""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+
+
+class Popularity:
+    """Exponentially decaying view counts per ticker, forgetting tickers nobody views any more."""
+
+    def __init__(self, half_life=POPULARITY_HALF_LIFE):
+        self.half_life = half_life
+        self._scores = {}  # ticker -> (score, updated)
+        self._lock = threading.Lock()
+
+    def _decayed(self, score, updated, now):
+        return score * 0.5 ** ((now - updated) / self.half_life)
+
+    def record(self, ticker, now=None):
+        now = now or time.time()
+        ticker = ticker.strip().upper()
+        with self._lock:
+            score, updated = self._scores.get(ticker, (0.0, now))
+            self._scores[ticker] = (self._decayed(score, updated, now) + 1, now)
+            if len(self._scores) > MAX_TRACKED:
+                self._prune(now)
+
+    def _prune(self, now):
+        """Drops faded tickers, then the least popular ones beyond MAX_TRACKED. Caller holds the lock."""
+        scores = {t: self._decayed(s, u, now) for t, (s, u) in self._scores.items()}
+        keep = sorted((t for t in scores if scores[t] >= MIN_SCORE), key=scores.get, reverse=True)[:MAX_TRACKED]
+        self._scores = {t: self._scores[t] for t in keep}
+        return keep
+
+    def top(self, n, now=None):
+        now = now or time.time()
+        with self._lock:
+            return self._prune(now)[:n]
+
+    def __len__(self):
+        return len(self._scores)
+
+
+class RefreshWorker:
+    def __init__(self, store=None, top_n=REFRESH_TOP_N, interval=REFRESH_INTERVAL,
+                 lead=REFRESH_LEAD, concurrency=REFRESH_CONCURRENCY, rate=REFRESH_RATE):
+        self.store = store or default_store()
+        self.top_n = top_n
+        self.interval = interval
+        self.lead = lead
+        self.popularity = Popularity()
+        self.limiter = RateLimiter(rate, burst=concurrency)
+        self._pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="refresh")
+        self._stop = threading.Event()
+        self._thread = None
+        self._stats = {'runs': 0, 'refreshed': 0, 'failed': 0, 'last_run': None}
+        self._stats_lock = threading.Lock()
+
+    def track(self, ticker):
+        """Records a view of `ticker`."""
+        self.popularity.record(ticker)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="refresh-worker", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            self.run_once()
+
+    def run_once(self):
+        """Refreshes everything that expires within `lead` for the top tickers."""
+        futures = [self._pool.submit(self._refresh, t) for t in self.popularity.top(self.top_n)]
+        wait(futures)
+        with self._stats_lock:
+            self._stats['runs'] += 1
+            self._stats['last_run'] = time.time()
+
+    def _refresh(self, ticker):
+        self.limiter.acquire()
+        ahead = time.time() + self.lead
+        try:
+            data = market_data.load_data(ticker, store=self.store, now=ahead)
+            price_history.load_history(ticker, store=self.store, now=ahead)
+            outcome = 'failed' if data['missing'] else 'refreshed'
+        except Exception:
+            outcome = 'failed'
+        with self._stats_lock:
+            self._stats[outcome] += 1
+
+    def stats(self):
+        """Worker counters plus the store hit/miss counts of user page loads."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        return {**stats, 'tracked': len(self.popularity), **market_data.cache_stats()}
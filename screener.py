@@ -0,0 +1,107 @@
+"""
+Watchlist / screener mode: fundamentals for hundreds of tickers at once.
+
+Prices come from batched yf.download calls (one request per batch), the
+statements from market_data.load_data on a bounded worker pool (so they
+also land in the shared statement store), and the metrics are computed for
+all tickers in one vectorized pass.
+"""
+
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import pandas as pd
+import yfinance as yf
+import market_data
+import statement_table
+from metrics import METRICS, compute_metrics
+
+PRICE_BATCH_SIZE = 100
+SCREEN_WORKERS = int(os.getenv("SCREEN_WORKERS", "8"))
+
+# Only what the screen needs: three requests per ticker (two statements and info) instead of seven.
+SCREEN_STATEMENTS = {
+    'annual': ('income_stmt', 'balance_sheet'),
+    'quarterly': ('quarterly_income_stmt', 'quarterly_balance_sheet'),
+}
+
+# Everything the income statement and balance sheet alone can answer.
+SCREEN_METRICS = [name for name in METRICS if name != 'Free Cash Flow']
+
+
+def parse_watchlist(text):
+    """'aapl, MSFT\\nnvda aapl' -> ['AAPL', 'MSFT', 'NVDA']"""
+    tickers = [t.upper() for t in re.split(r'[\s,;]+', text) if t]
+    return list(dict.fromkeys(tickers))
+
+
+def download_prices(tickers, batch_size=PRICE_BATCH_SIZE):
+    """Last close and one-year change for every ticker, indexed by ticker."""
+    closes = []
+    for start in range(0, len(tickers), batch_size):
+        batch = tickers[start:start + batch_size]
+        prices = yf.download(batch, period="1y", interval="1d", auto_adjust=True,
+                             progress=False, threads=True)
+        if prices.empty:
+            continue
+        close = prices['Close']
+        if isinstance(close, pd.Series):  # older yfinance, single ticker
+            close = close.to_frame(batch[0])
+        closes.append(close)
+    if not closes:
+        return pd.DataFrame(columns=['Price', '1Y Change'])
+
+    close = pd.concat(closes, axis=1).ffill()
+    return pd.DataFrame({
+        'Price': close.iloc[-1],
+        '1Y Change': close.iloc[-1] / close.bfill().iloc[0] - 1,
+    })
+
+
+def load_statements(tickers, frequency='annual', workers=SCREEN_WORKERS, progress=None):
+    """Loads the screen's statements for every ticker; `progress(done, total)` is called as they arrive."""
+    keys = SCREEN_STATEMENTS[frequency]
+    results = {}
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="screener") as pool:
+        futures = {pool.submit(market_data.load_data, t, keys=keys): t for t in tickers}
+        for done, future in enumerate(as_completed(futures), start=1):
+            ticker = futures[future]
+            try:
+                results[ticker] = future.result()
+            except Exception:
+                pass  # an unknown or delisted ticker just drops out of the screen
+            if progress:
+                progress(done, len(tickers))
+    return results
+
+
+def latest_statements(data, key):
+    """
+    Stacks the most recent period of one statement for every ticker:
+    line items × tickers, the same layout as a single ticker's items × periods.
+    """
+    period, statement, _ = market_data.STATEMENTS[key]
+    latest = {}
+    for ticker, raw_data in data.items():
+        frame = statement_table.view(raw_data['statements'], period, statement)
+        if not frame.empty:
+            latest[ticker] = frame[frame.columns.max()]
+    return pd.DataFrame(latest)
+
+
+def screen(tickers, frequency='annual', progress=None):
+    """One row per ticker with the dashboard's metrics plus price, P/E and market cap."""
+    income_key, balance_key = SCREEN_STATEMENTS[frequency]
+    data = load_statements(tickers, frequency, progress=progress)
+    results = compute_metrics(latest_statements(data, income_key),
+                              latest_statements(data, balance_key),
+                              metrics=SCREEN_METRICS)
+
+    for column, field in [('PE Ratio', 'trailingPE'), ('Market Cap', 'marketCap'),
+                          ('Debt/Equity', 'debtToEquity')]:
+        values = pd.Series({t: d['info'].get(field) for t, d in data.items()}, dtype=object)
+        results[column] = pd.to_numeric(values, errors='coerce')
+
+    results = results.join(download_prices(list(data)), how='left')
+    results.index.name = 'Ticker'
+    return results.sort_values('Market Cap', ascending=False)
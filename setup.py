@@ -3,27 +3,73 @@
 ==========================================
 Run this once after cloning the repo to set up your environment.
 
-Usage: python setup.py
+Usage:
+  python setup.py             # interactive: API keys, then packages
+  python setup.py --install   # just install requirements.txt (CI)
+  python setup.py --wheels    # fill the local wheel cache (.wheels/) for fast/offline installs
+  python setup.py --install --offline   # install from .wheels/ only
 """
 
+import argparse
 import os
+import re
 import subprocess
 import sys
+from importlib import metadata
 
-def install_requirements():
-    """Install required packages."""
-    print("\n📦 Installing required packages...")
-    packages = [
-        "crewai",
-        "crewai-tools", 
-        "python-dotenv",
-        "groq"
-    ]
-    for package in packages:
-        print(f"   Installing {package}...")
-        subprocess.check_call([sys.executable, "-m", "pip", "install", package, "-q"])
+ROOT = os.path.dirname(os.path.abspath(__file__))
+REQUIREMENTS_FILE = os.path.join(ROOT, "requirements.txt")
+WHEEL_CACHE = os.path.join(ROOT, ".wheels")
+
+def read_requirements(path=REQUIREMENTS_FILE):
+    """Requirement lines of requirements.txt, without comments."""
+    with open(path, encoding="utf-8") as f:
+        lines = [line.split("#", 1)[0].strip() for line in f]
+    return [line for line in lines if line]
+
+def is_satisfied(requirement):
+    """True when the installed distribution already meets `requirement` (extras are not checked)."""
+    try:
+        from packaging.requirements import Requirement
+    except ImportError:
+        # No packaging module: just check that something by that name is installed
+        name = re.match(r"[A-Za-z0-9._-]+", requirement).group(0)
+        try:
+            metadata.version(name)
+            return True
+        except metadata.PackageNotFoundError:
+            return False
+    parsed = Requirement(requirement)
+    try:
+        installed = metadata.version(parsed.name)
+    except metadata.PackageNotFoundError:
+        return False
+    return parsed.specifier.contains(installed, prereleases=True)
+
+def install_requirements(offline=False):
+    """Install whatever in requirements.txt is missing, in a single pip run."""
+    print("\n📦 Checking required packages...")
+    missing = [r for r in read_requirements() if not is_satisfied(r)]
+    if not missing:
+        print("   ✅ All packages already installed!")
+        return
+    print(f"   Installing {', '.join(missing)}...")
+    # One pip run resolves all dependencies together instead of once per package
+    command = [sys.executable, "-m", "pip", "install", "-q", *missing]
+    if os.path.isdir(WHEEL_CACHE) and os.listdir(WHEEL_CACHE):
+        command += ["--find-links", WHEEL_CACHE]  # prefer locally built wheels
+    if offline:
+        command.append("--no-index")
+    subprocess.check_call(command)
     print("   ✅ All packages installed!")
 
+def build_wheels():
+    """Download/build wheels for every requirement into .wheels/ (cache this directory in CI)."""
+    print(f"\n🛞 Building wheels into {WHEEL_CACHE}...")
+    subprocess.check_call([sys.executable, "-m", "pip", "wheel", "-q",
+                           "-r", REQUIREMENTS_FILE, "-w", WHEEL_CACHE])
+    print("   ✅ Wheel cache ready!")
+
 def setup_environment():
     print("""
     ╔══════════════════════════════════════════════════════════╗
@@ -82,4 +128,14 @@ def setup_environment():
     print("\n⚠️  Remember: Never commit .env to git!")
 
 if __name__ == "__main__":
-    setup_environment()
+    parser = argparse.ArgumentParser(description="Set up Agentic Software House")
+    parser.add_argument("--install", action="store_true", help="only install missing requirements")
+    parser.add_argument("--wheels", action="store_true", help="build the local wheel cache")
+    parser.add_argument("--offline", action="store_true", help="install from the wheel cache only")
+    args = parser.parse_args()
+    if args.wheels:
+        build_wheels()
+    if args.install:
+        install_requirements(offline=args.offline)
+    if not (args.install or args.wheels):
+        setup_environment()
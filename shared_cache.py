@@ -0,0 +1,223 @@
+"""
+Cross-process, zero-copy cache for the dashboard's frames.
+
+st.cache_data pickles every return value and hands each caller its own
+copy, and each server process keeps its own cache. Here every frame is
+written once as an uncompressed Arrow IPC file in shared memory
+(/dev/shm when available). Every session of every process memory-maps
+that file and gets a read-only view backed by the same pages. Memory then
+stays flat however many sessions and worker processes there are.
+
+Frames are mapped once per process and reused until the file changes.
+Writes are atomic (temp file + rename), so readers never see a partial
+file, and a process that still maps an older version keeps reading it.
+Expired files, and the oldest ones once the cache is over
+SHM_CACHE_MAX_MB, are deleted every so often as new ones are written.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+import pyarrow as pa
+import market_data
+import statement_store
+
+DEFAULT_ROOT = os.getenv("SHM_CACHE_DIR") or os.path.join(
+    "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir(), "fin_cache")
+
+# Same freshness as the st.cache_data entries this replaces.
+TTL_SECONDS = float(os.getenv("SHM_CACHE_TTL_SECONDS", "3600"))
+# Shared memory is RAM: cap what the cache may hold there.
+MAX_BYTES = int(float(os.getenv("SHM_CACHE_MAX_MB", "512")) * 1024 * 1024)
+PRUNE_INTERVAL_SECONDS = 60
+
+
+# Same directory names as the statement store uses.
+cache_key = statement_store.ticker_key
+
+
+class SharedFrameCache:
+    def __init__(self, root=DEFAULT_ROOT, ttl=TTL_SECONDS, max_bytes=MAX_BYTES):
+        self.root = root
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._mapped = {}  # path -> (mtime_ns, frame)
+        self._lock = threading.Lock()
+        self._pruned_at = 0.0
+        self._swept_at = 0.0
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, name, suffix):
+        return os.path.join(self.root, f"{name}{suffix}")
+
+    def _fresh_mtime(self, path, now=None):
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        if (now or time.time()) - mtime_ns / 1e9 > self.ttl:
+            return None
+        return mtime_ns
+
+    def _atomic_write(self, path, write):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        write(tmp)
+        os.replace(tmp, path)
+        self._maybe_prune()
+
+    # Cleanup
+    def _maybe_sweep(self):
+        """
+        Unmaps frames whose file has expired, been replaced or been pruned
+        (possibly by another process), so their pages can be freed.
+        """
+        now = time.time()
+        with self._lock:
+            if now - self._swept_at < PRUNE_INTERVAL_SECONDS:
+                return
+            self._swept_at = now
+            mapped = list(self._mapped.items())
+        stale = [path for path, (mtime_ns, _) in mapped if self._fresh_mtime(path, now) != mtime_ns]
+        with self._lock:
+            for path in stale:
+                self._mapped.pop(path, None)
+
+    def _maybe_prune(self):
+        now = time.time()
+        with self._lock:
+            if now - self._pruned_at < PRUNE_INTERVAL_SECONDS:
+                return
+            self._pruned_at = now
+        self.prune(now)
+
+    def prune(self, now=None):
+        """
+        Deletes expired files (including temp files left by a crashed
+        writer), then the oldest ones until the cache fits in max_bytes.
+        Processes that still map a deleted file keep their view of it.
+        """
+        now = now or time.time()
+        entries = []
+        for directory, _, names in os.walk(self.root):
+            for name in names:
+                path = os.path.join(directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                if now - stat.st_mtime > self.ttl:
+                    self._remove(path)
+                else:
+                    entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    def _remove(self, path):
+        with self._lock:
+            self._mapped.pop(path, None)
+        try:
+            os.remove(path)
+        except OSError:
+            pass  # already gone: another process pruned it first
+
+    # Frames
+    def get(self, name):
+        """Read-only DataFrame mapped from shared memory, or None if missing or expired."""
+        path = self._path(name, ".arrow")
+        mtime_ns = self._fresh_mtime(path)
+        self._maybe_sweep()
+        with self._lock:
+            if mtime_ns is None:
+                self._mapped.pop(path, None)
+                self.misses += 1
+                return None
+            mapped = self._mapped.get(path)
+            if mapped and mapped[0] == mtime_ns:
+                self.hits += 1
+                return mapped[1]
+        # Column buffers point straight into the mapping; numeric columns are not copied.
+        table = pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+        frame = table.to_pandas(split_blocks=True)
+        with self._lock:
+            self._mapped[path] = (mtime_ns, frame)
+            self.hits += 1
+        return frame
+
+    def put(self, name, frame):
+        table = pa.Table.from_pandas(frame)
+
+        def write(tmp):
+            with pa.OSFile(tmp, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        self._atomic_write(self._path(name, ".arrow"), write)
+
+    def get_or_load(self, name, load):
+        frame = self.get(name)
+        if frame is None:
+            self.put(name, load())
+            frame = self.get(name)
+        return frame
+
+    # Small JSON payloads (ticker info)
+    def get_json(self, name):
+        path = self._path(name, ".json")
+        if self._fresh_mtime(path) is None:
+            return None
+        try:
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put_json(self, name, payload):
+        def write(tmp):
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(payload, f, default=str)
+        self._atomic_write(self._path(name, ".json"), write)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {'hits': self.hits, 'misses': self.misses, 'mapped': len(self._mapped),
+                    'hit_rate': self.hits / lookups if lookups else 0.0}
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+def shared():
+    """The process-wide cache, backed by files every process can map."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = SharedFrameCache()
+        return _shared
+
+
+def load_data(ticker, cache=None):
+    """
+    market_data.load_data served from shared memory while fresh. Partial
+    results (anything under 'missing') are not shared, so the next load
+    retries Yahoo for the missing parts.
+    """
+    cache = cache or shared()
+    key = cache_key(ticker)
+    statements = cache.get(f"{key}/statements")
+    info = cache.get_json(f"{key}/info")
+    if statements is not None and info is not None:
+        return {'statements': statements, 'info': info, 'missing': []}
+
+    data = market_data.load_data(ticker)
+    if not data['missing']:
+        cache.put(f"{key}/statements", data['statements'])
+        cache.put_json(f"{key}/info", data['info'])
+        data['statements'] = cache.get(f"{key}/statements")
+    return data
@@ -0,0 +1,102 @@
+"""
+Vectorized batch of snake games: N boards advanced by one NumPy step.
+
+Same rules as snake_core.SnakeCore, but every piece of state is an array
+over the batch, so one step() moves thousands of games at once. Instead of
+a list of body cells, each board stores the tick at which every cell was
+last entered by a head. A cell is part of the body while its age is below
+the snake's length, so the tail "moves" for free and growing is just
+length += 1. Finished games reset on their own; their final scores are
+reported by step().
+"""
+
+import numpy as np
+from snake_core import start_cells
+
+# Action / direction codes, clockwise; (d + 2) % 4 is the reverse of d.
+UP, RIGHT, DOWN, LEFT = 0, 1, 2, 3
+DELTAS = np.array([(0, -1), (1, 0), (0, 1), (-1, 0)])  # (dx, dy)
+
+NEVER = np.iinfo(np.int64).min // 2  # "entered" time of a cell that is not part of the body
+
+
+class SnakeBatch:
+    def __init__(self, n, width=40, height=30, seed=None):
+        self.n = n
+        self.width = width
+        self.height = height
+        self.rng = np.random.default_rng(seed)
+        self.start = start_cells(width, height)  # tail to head, moving right
+        self.entered = np.full((n, height, width), NEVER, dtype=np.int64)
+        self.time = np.zeros(n, dtype=np.int64)
+        self.head = np.zeros((n, 2), dtype=np.int64)  # (x, y)
+        self.direction = np.zeros(n, dtype=np.int64)
+        self.length = np.zeros(n, dtype=np.int64)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.food = np.zeros((n, 2), dtype=np.int64)  # (-1, -1) once the board is full
+        self.games = np.zeros(n, dtype=np.int64)
+        self.reset(np.arange(n))
+
+    def occupancy(self, idx=slice(None)):
+        """Boolean body grids, shape (n, height, width)."""
+        age = self.time[idx, None, None] - self.entered[idx]
+        return age < self.length[idx, None, None]
+
+    def reset(self, idx):
+        self.entered[idx] = NEVER
+        for i, (x, y) in enumerate(self.start):
+            self.entered[idx, y, x] = self.time[idx] - (len(self.start) - 1 - i)
+        self.head[idx] = self.start[-1]
+        self.direction[idx] = RIGHT
+        self.length[idx] = len(self.start)
+        self.score[idx] = 0
+        self.place_food(idx)
+
+    def place_food(self, idx):
+        """Puts food on a uniformly random free cell of each board in `idx`."""
+        if len(idx) == 0:
+            return
+        free = ~self.occupancy(idx).reshape(len(idx), -1)
+        keys = self.rng.random(free.shape)
+        keys[~free] = -1.0
+        cell = keys.argmax(axis=1)
+        full = ~free.any(axis=1)
+        self.food[idx, 0] = np.where(full, -1, cell % self.width)
+        self.food[idx, 1] = np.where(full, -1, cell // self.width)
+
+    def step(self, actions=None):
+        """
+        Advances every board one tick. `actions` holds a direction code per
+        board (or -1 to keep going); turning straight back is ignored.
+        Returns (ate, died, final_scores) - final_scores is the score of each
+        game that just ended (0 elsewhere); those boards are already reset.
+        """
+        if actions is not None:
+            actions = np.asarray(actions)
+            turn = (actions >= 0) & (actions != (self.direction + 2) % 4)
+            self.direction = np.where(turn, actions, self.direction)
+
+        new_head = self.head + DELTAS[self.direction]
+        x, y = new_head[:, 0], new_head[:, 1]
+        self.time += 1
+        outside = (x < 0) | (x >= self.width) | (y < 0) | (y >= self.height)
+        rows = np.arange(self.n)
+        xc, yc = np.clip(x, 0, self.width - 1), np.clip(y, 0, self.height - 1)
+        # The tail has already moved on at the new time, so the head may enter its cell
+        hit_body = self.time - self.entered[rows, yc, xc] < self.length
+        died = outside | hit_body
+
+        alive = np.flatnonzero(~died)
+        self.entered[alive, y[alive], x[alive]] = self.time[alive]
+        self.head[alive] = new_head[alive]
+        ate = ~died & (x == self.food[:, 0]) & (y == self.food[:, 1])
+        self.length += ate
+        self.score += ate
+        self.place_food(np.flatnonzero(ate))
+
+        final_scores = np.where(died, self.score, 0)
+        dead = np.flatnonzero(died)
+        if len(dead):
+            self.games[dead] += 1
+            self.reset(dead)
+        return ate, died, final_scores
@@ -0,0 +1,99 @@
+"""
+🐍 SNAKE BENCHMARK
+==================
+Runs the headless SnakeCore as fast as it will go, with no display, and
+reports simulation ticks per second. A simple greedy bot steers towards the
+food so games last long enough for the snake to grow; dead games reset
+automatically. The same seed always produces the same games.
+
+With --batch N the games run in snake_batch.SnakeBatch instead: N boards
+per vectorized step, with the same greedy idea expressed over arrays.
+
+Usage:
+  python snake_benchmark.py                    # 1,000,000 ticks, seed 0
+  python snake_benchmark.py --ticks 5000000 --seed 42
+  python snake_benchmark.py --policy none      # no bot: time step() alone
+  python snake_benchmark.py --batch 4096       # 4096 games at once (needs NumPy)
+"""
+
+import argparse
+import sys
+import time
+from snake_core import MOVES, OPPOSITE, SnakeCore
+
+
+def greedy(core):
+    """Turns towards the food, avoiding walls and the body when it can."""
+    head = core.snake[-1]
+    food = core.food or head
+    best = None
+    for direction, (dx, dy) in MOVES.items():
+        if direction == OPPOSITE[core.direction]:
+            continue
+        cell = (head[0] + dx, head[1] + dy)
+        if not (0 <= cell[0] < core.width and 0 <= cell[1] < core.height) or cell in core.occupied:
+            continue
+        distance = abs(food[0] - cell[0]) + abs(food[1] - cell[1])
+        if best is None or distance < best[0]:
+            best = (distance, direction)
+    return best[1] if best else None
+
+
+POLICIES = {'greedy': greedy, 'none': lambda core: None}
+
+
+def run(ticks, seed=0, width=40, height=30, policy=greedy):
+    """Returns (seconds, games, total score)."""
+    core = SnakeCore(width, height, seed)
+    games, total_score = 1, 0
+    started = time.perf_counter()
+    for _ in range(ticks):
+        if not core.step(policy(core)):
+            total_score += core.score
+            games += 1
+            core.reset()
+    elapsed = time.perf_counter() - started
+    return elapsed, games, total_score + core.score
+
+
+def run_batch(n, ticks, seed=0, width=40, height=30):
+    """Vectorized run: ~`ticks` board-steps in total across `n` boards. Returns (seconds, games, total score)."""
+    import numpy as np
+    from snake_batch import DOWN, LEFT, RIGHT, UP, SnakeBatch
+
+    batch = SnakeBatch(n, width, height, seed)
+    games, total_score = 0, 0
+    started = time.perf_counter()
+    for _ in range(max(1, ticks // n)):
+        dx = batch.food[:, 0] - batch.head[:, 0]
+        dy = batch.food[:, 1] - batch.head[:, 1]
+        actions = np.where(dx > 0, RIGHT, np.where(dx < 0, LEFT, np.where(dy > 0, DOWN, UP)))
+        _, died, final_scores = batch.step(actions)
+        games += int(died.sum())
+        total_score += int(final_scores.sum())
+    elapsed = time.perf_counter() - started
+    return elapsed, games + n, total_score + int(batch.score.sum())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the headless snake simulation")
+    parser.add_argument("--ticks", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--width", type=int, default=40)
+    parser.add_argument("--height", type=int, default=30)
+    parser.add_argument("--policy", choices=list(POLICIES), default="greedy")
+    parser.add_argument("--batch", type=int, metavar="N", help="run N games at once in snake_batch")
+    args = parser.parse_args()
+
+    if args.batch:
+        elapsed, games, score = run_batch(args.batch, args.ticks, args.seed, args.width, args.height)
+        args.ticks = max(1, args.ticks // args.batch) * args.batch
+    else:
+        elapsed, games, score = run(args.ticks, args.seed, args.width, args.height, POLICIES[args.policy])
+    print(f"🐍 {args.ticks:,} ticks in {elapsed:.2f}s -> {args.ticks / elapsed:,.0f} ticks/s")
+    print(f"🎮 {games:,} games, mean score {score / games:.1f} ({args.width}x{args.height}, seed {args.seed})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""
+Headless snake simulation: the rules of snake_game.py without pygame.
+
+One call to step() is one fixed simulation tick. All randomness comes from
+a seeded random.Random, so a seed plus the list of turns replays a game
+exactly - for bots, replays and throughput tests on machines without a
+display. Positions are grid cells (column, row); the pygame layer scales
+them to pixels.
+"""
+
+import random
+from collections import deque
+
+MOVES = {'up': (0, -1), 'down': (0, 1), 'left': (-1, 0), 'right': (1, 0)}
+OPPOSITE = {'up': 'down', 'down': 'up', 'left': 'right', 'right': 'left'}
+START = ((10, 10), (11, 10), (12, 10))  # tail to head, moving right
+
+
+def start_cells(width, height):
+    """START, moved left/up as needed so the whole snake starts on a smaller board."""
+    if width < len(START) or height < 1:
+        raise ValueError(f"Board must be at least {len(START)}x1 cells, got {width}x{height}")
+    x = min(START[0][0], (width - len(START)) // 2)
+    y = min(START[0][1], height // 2)
+    return tuple((x + i, y) for i in range(len(START)))
+
+
+class SnakeCore:
+    def __init__(self, width=40, height=30, seed=None):
+        self.width = width
+        self.height = height
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.start = start_cells(width, height)
+        # Free cells as a list plus each cell's index, so taking or freeing a cell is O(1).
+        # Built once; reset() copies them, which is much cheaper than rebuilding.
+        self.start_free = [(x, y) for x in range(width) for y in range(height) if (x, y) not in self.start]
+        self.start_index = {cell: i for i, cell in enumerate(self.start_free)}
+        self.reset()
+
+    def reset(self):
+        self.snake = deque(self.start)
+        self.occupied = set(self.snake)
+        self.free_cells = self.start_free.copy()
+        self.free_index = self.start_index.copy()
+        self.food = self.generate_food()
+        self.score = 0
+        self.direction = 'right'
+        self.alive = True
+        self.ticks = 0
+        self.changed = []  # cells that changed during the last step
+
+    def occupy(self, cell):
+        i = self.free_index.pop(cell)
+        last = self.free_cells.pop()
+        if i < len(self.free_cells):
+            self.free_cells[i] = last
+            self.free_index[last] = i
+        self.occupied.add(cell)
+
+    def vacate(self, cell):
+        self.occupied.discard(cell)
+        self.free_index[cell] = len(self.free_cells)
+        self.free_cells.append(cell)
+
+    def generate_food(self):
+        # Sampled straight from the free cells: no retries, however full the board is
+        if not self.free_cells:
+            return None
+        return self.rng.choice(self.free_cells)
+
+    def turn(self, direction):
+        """Changes direction, ignoring a turn straight back into the body."""
+        if direction != OPPOSITE[self.direction]:
+            self.direction = direction
+
+    def step(self, direction=None):
+        """Advances one tick (turning first, if given). Returns False once the snake has died."""
+        if not self.alive:
+            return False
+        if direction is not None:
+            self.turn(direction)
+        self.ticks += 1
+        self.changed = []
+
+        head = self.snake[-1]
+        dx, dy = MOVES[self.direction]
+        new_head = (head[0] + dx, head[1] + dy)
+
+        ate = self.food == new_head
+        if not ate:
+            # The tail moves away first, so the head may follow it into that cell
+            tail = self.snake.popleft()
+            self.vacate(tail)
+            self.changed.append(tail)
+
+        if (not 0 <= new_head[0] < self.width or not 0 <= new_head[1] < self.height
+                or new_head in self.occupied):
+            self.alive = False
+            return False
+
+        self.snake.append(new_head)
+        self.occupy(new_head)
+        self.changed.append(new_head)
+        if ate:
+            self.score += 1
+            self.food = self.generate_food()
+            if self.food is not None:
+                self.changed.append(self.food)
+        return True
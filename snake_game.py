@@ -1,90 +1,110 @@
-
 import pygame
-import sys
-import random
-
-# Initialize Pygame
-pygame.init()
+import time
+from snake_core import SnakeCore
 
 # Set up some constants
 WIDTH, HEIGHT = 800, 600
 BACKGROUND_COLOR = (0, 0, 0)
 SNAKE_COLOR = (0, 255, 0)
 FOOD_COLOR = (255, 0, 0)
-SCORE_FONT = pygame.font.SysFont('Arial', 24)
+CELL_SIZE = 20
+TICK_RATE = 10  # simulation steps per second, independent of the frame rate
+FPS = 60
+
+KEYS = {pygame.K_UP: 'up', pygame.K_DOWN: 'down', pygame.K_LEFT: 'left', pygame.K_RIGHT: 'right'}
 
 class SnakeGame:
-    def __init__(self):
+    """pygame front end: input and rendering on top of the headless SnakeCore."""
+
+    def __init__(self, seed=None):
+        pygame.init()
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
         self.clock = pygame.time.Clock()
-        self.snake = [(200, 200), (220, 200), (240, 200)]
-        self.food = self.generate_food()
-        self.score = 0
-        self.direction = 'right'
-
-    def generate_food(self):
-        while True:
-            x = random.randint(0, WIDTH - 20) // 20 * 20
-            y = random.randint(0, HEIGHT - 20) // 20 * 20
-            food = (x, y)
-            if food not in self.snake:
-                return food
+        self.font = pygame.font.SysFont('Arial', 24)
+        self.core = SnakeCore(WIDTH // CELL_SIZE, HEIGHT // CELL_SIZE, seed)
+        self.running = True
+        # Rendering state: cells changed since the last frame, and the cached score text
+        self.changed = []
+        self.full_redraw = True
+        self.score_surface = None
+        self.score_rect = pygame.Rect(10, 10, 0, 0)
+        self.rendered_score = None
 
     def handle_events(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_UP and self.direction != 'down':
-                    self.direction = 'up'
-                elif event.key == pygame.K_DOWN and self.direction != 'up':
-                    self.direction = 'down'
-                elif event.key == pygame.K_LEFT and self.direction != 'right':
-                    self.direction = 'left'
-                elif event.key == pygame.K_RIGHT and self.direction != 'left':
-                    self.direction = 'right'
+                self.running = False
+            elif event.type == pygame.KEYDOWN and event.key in KEYS:
+                self.core.turn(KEYS[event.key])
 
     def update_game_state(self):
-        head = self.snake[-1]
-        if self.direction == 'up':
-            new_head = (head[0], head[1] - 20)
-        elif self.direction == 'down':
-            new_head = (head[0], head[1] + 20)
-        elif self.direction == 'left':
-            new_head = (head[0] - 20, head[1])
-        elif self.direction == 'right':
-            new_head = (head[0] + 20, head[1])
+        if not self.core.step():
+            self.running = False
+        self.changed.extend(self.core.changed)
 
-        self.snake.append(new_head)
-        if self.food == new_head:
-            self.score += 1
-            self.food = self.generate_food()
+    def draw_cell(self, cell):
+        if cell in self.core.occupied:
+            color = SNAKE_COLOR
+        elif cell == self.core.food:
+            color = FOOD_COLOR
         else:
-            self.snake.pop(0)
+            color = BACKGROUND_COLOR
+        return pygame.draw.rect(self.screen, color,
+                                (cell[0] * CELL_SIZE, cell[1] * CELL_SIZE, CELL_SIZE, CELL_SIZE))
 
-        if (new_head[0] < 0 or new_head[0] >= WIDTH or
-            new_head[1] < 0 or new_head[1] >= HEIGHT or
-            new_head in self.snake[:-1]):
-            pygame.quit()
-            sys.exit()
+    def draw_score(self):
+        # The text is only rendered again when the score changes
+        if self.core.score != self.rendered_score:
+            self.score_surface = self.font.render(f'Score: {self.core.score}', True, (255, 255, 255))
+            self.rendered_score = self.core.score
+        area = self.score_rect.union(self.score_surface.get_rect(topleft=(10, 10)))
+        self.screen.fill(BACKGROUND_COLOR, area)
+        # Repaint the cells under the text (the old text may have been wider)
+        for x in range(area.left // CELL_SIZE, (area.right - 1) // CELL_SIZE + 1):
+            for y in range(area.top // CELL_SIZE, (area.bottom - 1) // CELL_SIZE + 1):
+                if (x, y) in self.core.occupied or (x, y) == self.core.food:
+                    self.draw_cell((x, y))
+        self.score_rect = self.screen.blit(self.score_surface, (10, 10))
+        return area
 
     def draw_game(self):
-        self.screen.fill(BACKGROUND_COLOR)
-        for pos in self.snake:
-            pygame.draw.rect(self.screen, SNAKE_COLOR, (pos[0], pos[1], 20, 20))
-        pygame.draw.rect(self.screen, FOOD_COLOR, (self.food[0], self.food[1], 20, 20))
-        score_text = SCORE_FONT.render(f'Score: {self.score}', True, (255, 255, 255))
-        self.screen.blit(score_text, (10, 10))
-        pygame.display.update()
+        if self.full_redraw:
+            self.screen.fill(BACKGROUND_COLOR)
+            for pos in self.core.snake:
+                self.draw_cell(pos)
+            if self.core.food is not None:
+                self.draw_cell(self.core.food)
+            self.draw_score()
+            self.changed.clear()
+            self.full_redraw = False
+            pygame.display.update()
+            return
+
+        # Only the cells that changed since the last frame (new head, old tail, new food)
+        dirty = [self.draw_cell(cell) for cell in self.changed]
+        self.changed.clear()
+        if self.core.score != self.rendered_score or self.score_rect.collidelist(dirty) != -1:
+            dirty.append(self.draw_score())
+        pygame.display.update(dirty)
 
     def run(self):
-        while True:
+        # Fixed timestep: the simulation advances TICK_RATE times per second
+        # whatever the frame rate, catching up if a frame ran long.
+        step = 1 / TICK_RATE
+        previous = time.perf_counter()
+        lag = 0.0
+        while self.running:
             self.handle_events()
-            self.update_game_state()
+            now = time.perf_counter()
+            lag += now - previous
+            previous = now
+            while lag >= step and self.running:
+                self.update_game_state()
+                lag -= step
             self.draw_game()
-            self.clock.tick(10)
+            self.clock.tick(FPS)
+        pygame.quit()
 
 if __name__ == '__main__':
     game = SnakeGame()
-    game.run()
\ No newline at end of file
+    game.run()
@@ -0,0 +1,172 @@
+"""
+Persistent local store for yfinance financial statements.
+
+One long-format Parquet table per ticker holding every statement (see
+statement_table.py), plus the ticker's info and price bars:
+
+    <FIN_STORE_DIR>/AAPL/statements.parquet
+    <FIN_STORE_DIR>/AAPL/info.json
+    <FIN_STORE_DIR>/AAPL/prices.parquet # daily OHLCV bars (see price_history.py)
+    <FIN_STORE_DIR>/AAPL/meta.json      # when each statement was last checked
+
+Reads are memory-mapped and writes are atomic (temp file + rename), so any
+number of dashboard processes can share one directory. Statements are only
+re-fetched once a new period can actually have been published, and new
+periods are merged into the stored ones, so history older than what Yahoo
+currently returns is kept.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+import pandas as pd
+import pyarrow.parquet as pq
+import statement_table
+
+DEFAULT_ROOT = os.getenv("FIN_STORE_DIR", ".fin_store")
+
+# How long a period lasts and how long companies usually take to file it.
+PERIOD_DAYS = {'annual': 365, 'quarterly': 91}
+FILING_LAG_DAYS = {'annual': 90, 'quarterly': 45}
+
+# Once a new period is due, ask Yahoo at most this often until it shows up.
+RECHECK_SECONDS = 24 * 3600
+
+# Prices and ratios in `info` move every day, so it gets a plain TTL.
+INFO_TTL_SECONDS = 3600
+
+# Daily price bars are topped up at most this often.
+PRICES_TTL_SECONDS = 3600
+
+
+def ticker_key(ticker):
+    """A ticker as a single, safe path component."""
+    key = re.sub(r'[^A-Z0-9.^=-]', '_', ticker.strip().upper())
+    return re.sub(r'^\.', '_', key) or '_'  # never '', '.' or '..'
+
+
+class StatementStore:
+    def __init__(self, root=DEFAULT_ROOT):
+        self.root = root
+        self._write_lock = threading.Lock()  # statements.parquet is read-modify-write
+
+    # Paths and small JSON files
+    def _dir(self, ticker):
+        return os.path.join(self.root, ticker_key(ticker))
+
+    def _path(self, ticker, name):
+        return os.path.join(self._dir(ticker), name)
+
+    def _atomic_write(self, path, write):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Per thread as well as per process: session threads and the refresh
+        # worker may write the same file at once
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        write(tmp)
+        os.replace(tmp, path)
+
+    def _read_json(self, ticker, name):
+        try:
+            with open(self._path(ticker, name), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_json(self, ticker, name, payload):
+        def write(tmp):
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(payload, f, default=str)
+        self._atomic_write(self._path(ticker, name), write)
+
+    def _mark_checked(self, ticker, keys, now):
+        meta = self._read_json(ticker, 'meta.json') or {}
+        meta.update({key: now for key in keys})
+        self._write_json(ticker, 'meta.json', meta)
+
+    # Statements
+    def read_table(self, ticker):
+        """Returns every stored statement of `ticker` as one long table."""
+        path = self._path(ticker, 'statements.parquet')
+        if not os.path.exists(path):
+            return statement_table.empty()
+        return statement_table.normalize(pq.read_table(path, memory_map=True).to_pandas())
+
+    def read(self, ticker, period, statement):
+        """Returns the stored statement in yfinance layout (line items × periods, newest first)."""
+        return statement_table.view(self.read_table(ticker), period, statement)
+
+    def write_statements(self, ticker, frames, now=None):
+        """
+        Merges freshly fetched statements ({(period, statement): frame}) into
+        the stored table in one write and returns the updated table.
+        """
+        now = now or time.time()
+        fresh = [statement_table.to_long(frame, period, statement)
+                 for (period, statement), frame in frames.items()]
+        path = self._path(ticker, 'statements.parquet')
+        with self._write_lock:
+            table = statement_table.merge(self.read_table(ticker), pd.concat(fresh))
+            self._atomic_write(path, lambda tmp: table.to_parquet(tmp))
+            self._mark_checked(ticker, [f"{period}_{statement}" for period, statement in frames], now)
+        return table
+
+    def write(self, ticker, period, statement, frame, now=None):
+        """Merges a freshly fetched statement into the stored one and returns the result."""
+        table = self.write_statements(ticker, {(period, statement): frame}, now)
+        return statement_table.view(table, period, statement)
+
+    def needs_refresh(self, ticker, period, statement, now=None):
+        """True when the statement was never fetched or a newer period should be out by now."""
+        now = now or time.time()
+        key = f"{period}_{statement}"
+        checked = (self._read_json(ticker, 'meta.json') or {}).get(key)
+        if checked is None or not os.path.exists(self._path(ticker, 'statements.parquet')):
+            return True
+        if now - checked < RECHECK_SECONDS:
+            return False
+        stored = self.read(ticker, period, statement)
+        if stored.empty:
+            return True
+        latest = pd.Timestamp(stored.columns.max())
+        due = latest + pd.Timedelta(days=PERIOD_DAYS[period] + FILING_LAG_DAYS[period])
+        return pd.Timestamp(now, unit='s') >= due
+
+    # Info
+    def read_info(self, ticker, now=None):
+        """Returns the cached `info` dict, or None if it is missing or older than INFO_TTL_SECONDS."""
+        now = now or time.time()
+        cached = self._read_json(ticker, 'info.json')
+        if not cached or now - cached['fetched'] > INFO_TTL_SECONDS:
+            return None
+        return cached['info']
+
+    def write_info(self, ticker, info, now=None):
+        self._write_json(ticker, 'info.json', {'fetched': now or time.time(), 'info': info})
+
+    # Prices
+    def read_prices(self, ticker):
+        path = self._path(ticker, 'prices.parquet')
+        if not os.path.exists(path):
+            return None
+        return pq.read_table(path, memory_map=True).to_pandas()
+
+    def write_prices(self, ticker, frame, now=None):
+        path = self._path(ticker, 'prices.parquet')
+        self._atomic_write(path, lambda tmp: frame.to_parquet(tmp))
+        with self._write_lock:
+            self._mark_checked(ticker, ['prices'], now or time.time())
+
+    def prices_stale(self, ticker, now=None):
+        checked = (self._read_json(ticker, 'meta.json') or {}).get('prices')
+        return checked is None or (now or time.time()) - checked > PRICES_TTL_SECONDS
+
+
+_default_store = None
+
+def default_store():
+    global _default_store
+    if _default_store is None:
+        _default_store = StatementStore()
+    return _default_store
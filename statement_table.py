@@ -0,0 +1,93 @@
+"""
+Long-format financial statements.
+
+Every statement of a ticker lives in one table with a row per
+(frequency, statement, line item, period end) and a single value column.
+Frequency, statement and line item are categoricals and missing values
+are simply absent, so one ticker costs a few kilobytes instead of six
+mostly-empty wide frames. The wide layout the metrics engine expects
+(line items × periods, newest first) is derived on demand by `view`,
+optionally restricted to the last N years.
+"""
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = ['frequency', 'statement', 'item', 'period_end', 'value']
+KEY = ['frequency', 'statement', 'item', 'period_end']
+
+FREQUENCY = pd.CategoricalDtype(['annual', 'quarterly'])
+STATEMENT = pd.CategoricalDtype(['income_stmt', 'balance_sheet', 'cash_flow'])
+
+
+def normalize(table):
+    """Column order, dtypes and categoricals of the long table."""
+    return table[COLUMNS].astype({
+        'frequency': FREQUENCY,
+        'statement': STATEMENT,
+        'item': 'category',
+        'period_end': 'datetime64[ns]',
+        'value': 'float64',
+    }).reset_index(drop=True)
+
+
+def empty():
+    return normalize(pd.DataFrame({column: [] for column in COLUMNS}))
+
+
+def to_long(frame, frequency, statement):
+    """yfinance layout (line items × period ends) -> long rows."""
+    if frame is None or frame.empty:
+        return empty()
+    values = frame.apply(pd.to_numeric, errors='coerce').to_numpy(dtype='float64')
+    # Built from flat arrays rather than melt(), whose handling of Timestamp
+    # column labels differs between pandas versions
+    rows, columns = values.shape
+    long = pd.DataFrame({
+        'item': np.repeat(frame.index.astype(str).to_numpy(), columns),
+        'period_end': np.tile(pd.to_datetime(frame.columns).to_numpy(), rows),
+        'value': values.ravel(),
+    }).dropna(subset=['value'])
+    return normalize(long.assign(frequency=frequency, statement=statement))
+
+
+def merge(stored, fresh):
+    """Fresh rows win; stored periods Yahoo no longer returns are kept."""
+    combined = pd.concat([fresh, stored], ignore_index=True)
+    combined = combined.drop_duplicates(KEY, keep='first')
+    return normalize(combined.sort_values(KEY))
+
+
+def window(rows, years=None):
+    """Keeps the last `years` years of periods (None = all of them)."""
+    if years is None or rows.empty:
+        return rows
+    cutoff = rows['period_end'].max() - pd.DateOffset(years=years)
+    return rows[rows['period_end'] > cutoff]
+
+
+def view(table, frequency, statement, years=None):
+    """One statement in yfinance layout: line items × period ends, newest first."""
+    rows = table[(table['frequency'] == frequency) & (table['statement'] == statement)]
+    rows = window(rows, years)
+    if rows.empty:
+        return pd.DataFrame()
+    wide = rows.assign(item=rows['item'].astype(str)).pivot(
+        index='item', columns='period_end', values='value')
+    wide = wide.sort_index(axis=1, ascending=False)
+    wide.index.name = wide.columns.name = None
+    return wide
+
+
+if __name__ == '__main__':
+    # Round-trip check: python statement_table.py
+    periods = pd.to_datetime(['2024-12-31', '2023-12-31', '2022-12-31'])
+    frame = pd.DataFrame({periods[0]: [1.0, None], periods[1]: [2.0, 5.0], periods[2]: ['3', None]},
+                         index=['Total Revenue', 'Net Income'])
+    table = to_long(frame, 'annual', 'income_stmt')
+    assert len(table) == 4, table
+    expected = frame.apply(pd.to_numeric).astype('float64')
+    pd.testing.assert_frame_equal(view(table, 'annual', 'income_stmt').loc[expected.index],
+                                  expected, check_freq=False, check_names=False, check_column_type=False)
+    assert view(table, 'annual', 'income_stmt', years=1).columns.tolist() == [periods[0]]
+    print('statement_table round trip OK')
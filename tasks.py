@@ -189,6 +189,10 @@ task_design_architecture = Task(
         - stock.history(period="max") (for candlestick chart)
         
         Implements try/except for EACH fetch operation.
+        Normalizes the six statements into ONE long table
+        (frequency, statement, item, period_end, value) so the
+        Quarterly/Annual and 5Y/10Y/Max views are sliced and pivoted
+        from the cached table, never fetched again.
         '''
 
     def safe_get(data, key, default="N/A"):
@@ -202,8 +206,17 @@ task_design_architecture = Task(
     Design chart creation functions for each visualization:
 
     ```python
+    def prepare_price_history(history_df, timeframe, max_points=1500):
+        '''
+        Slices the daily history to the sidebar timeframe on the server
+        ("Last 5 Years" -> last 5 years of rows), then resamples to weekly,
+        then monthly OHLCV bars (Open=first, High=max, Low=min, Close=last,
+        Volume=sum) until at most max_points bars remain.
+        Never send decades of daily bars to the browser.
+        '''
+
     def create_candlestick_chart(history_df, ticker):
-        '''Creates interactive candlestick with volume subplot'''
+        '''Creates interactive candlestick with volume subplot from prepare_price_history() output'''
 
     def create_revenue_income_chart(financials_df, ticker):
         '''Creates grouped bar chart: Revenue vs Net Income'''
@@ -222,6 +235,15 @@ task_design_architecture = Task(
 
     def create_debt_cash_chart(balance_df, ticker):
         '''Creates stacked bar: Debt vs Cash'''
+
+    @st.cache_data(max_entries=256)
+    def cached_figure_json(chart_name, ticker, timeframe, data_version):
+        '''
+        Builds the figure with the matching create_*_chart() and returns
+        fig.to_json(). Render with st.plotly_chart(plotly.io.from_json(...)).
+        Every rerun (any widget click) then reuses the serialized figure
+        instead of rebuilding it; max_entries bounds memory (LRU eviction).
+        '''
     ```
 
     ### 4. Plotly Theme Configuration
@@ -459,6 +481,7 @@ task_write_code = Task(
 
     **Tab 1: Snapshot**
     - Candlestick chart with volume (use make_subplots)
+    - Draw prepare_price_history(history, timeframe), never the raw max history
     - Chart config: dark theme, height=500
 
     **Tab 2: Growth Engine**
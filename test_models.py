@@ -1,28 +1,30 @@
-import os
-import google.generativeai as genai
+import argparse
 from dotenv import load_dotenv
+from model_registry import ROLE_PREFERENCES, ModelRegistry
 
-# טעינת המפתח
+# טעינת המפתחות
 load_dotenv()
-api_key = os.getenv("GOOGLE_API_KEY")
 
-if not api_key:
-    print("❌ שגיאה: לא נמצא מפתח API בקובץ .env")
-else:
-    # חיבור לגוגל
-    genai.configure(api_key=api_key)
+parser = argparse.ArgumentParser(description="הצגת המודלים הזמינים מה-registry")
+parser.add_argument("--refresh", action="store_true", help="גילוי מחדש מכל הספקים (מתעלם מה-cache)")
+args = parser.parse_args()
 
+registry = ModelRegistry()
+if args.refresh:
     print("🔍 בודק איזה מודלים זמינים עבורך...")
-    try:
-        found = False
-        for m in genai.list_models():
-            # אנחנו מחפשים רק מודלים שיודעים לייצר טקסט (generateContent)
-            if 'generateContent' in m.supported_generation_methods:
-                print(f"- {m.name}")
-                found = True
-        
-        if not found:
-            print("❌ לא נמצאו מודלים זמינים. בדוק את המפתח שלך.")
-            
-    except Exception as e:
-        print(f"❌ שגיאה בחיבור: {e}")
\ No newline at end of file
+    registry.refresh()
+
+data = registry.data()
+for provider, error in data.get("errors", {}).items():
+    print(f"❌ שגיאה בחיבור ל-{provider}: {error}")
+
+models = {name: info for name, info in registry.models().items() if registry.available(name)}
+if not models:
+    print("❌ לא נמצאו מודלים זמינים. בדוק את המפתחות בקובץ .env")
+else:
+    for name, info in sorted(models.items()):
+        context = info.get("context_window") or "?"
+        print(f"- {name} (context: {context}, {', '.join(info['capabilities'])})")
+
+for role in ROLE_PREFERENCES:
+    print(f"🧠 {role}: {registry.choose(role)}")
@@ -0,0 +1,291 @@
+"""
+🌐 AGENTIC SOFTWARE HOUSE - Transport
+=====================================
+One shared, pooled HTTP layer for all LLM and tool traffic.
+
+LLM calls (crewai's LLM goes through litellm) share one httpx client with
+keep-alive, HTTP/2 multiplexing (when the `h2` package is installed) and a
+cap on concurrent requests per host. The web tools (Serper search, website
+scraping) share one pooled requests.Session instead of opening a fresh
+connection for every call.
+
+Settings (environment, all optional):
+  HTTP_MAX_CONNECTIONS=100     total open connections
+  HTTP_MAX_KEEPALIVE=20        idle connections kept around for reuse
+  HTTP_KEEPALIVE_SECONDS=60    how long an idle connection is kept
+  HTTP_PER_HOST_LIMIT=8        concurrent requests per host
+  HTTP2=1                      use HTTP/2 where the server supports it (0 = off)
+"""
+
+import asyncio
+import importlib
+import importlib.util
+import os
+import threading
+from collections import defaultdict
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+# Modules of the crewai_tools web tools that call requests.get/post directly.
+TOOL_MODULES = [
+    "crewai_tools.tools.serper_dev_tool.serper_dev_tool",
+    "crewai_tools.tools.scrape_website_tool.scrape_website_tool",
+]
+
+_lock = threading.Lock()
+_client = None
+_async_client = None
+_session = None
+_stats = {"requests": 0, "connections": 0, "http2": 0}
+
+
+def _setting(name, default):
+    value = os.getenv(name, "").strip()
+    return int(value) if value else default
+
+
+def http2_enabled():
+    return os.getenv("HTTP2", "1") != "0" and importlib.util.find_spec("h2") is not None
+
+# =============================================================================
+# 📊 STATISTICS
+# =============================================================================
+
+def _count(key, amount=1):
+    with _lock:
+        _stats[key] += amount
+
+
+def _trace(event, info):
+    # httpcore reports every new TCP connection; anything else was a reused one.
+    if event == "connection.connect_tcp.complete":
+        _count("connections")
+
+
+def connection_stats():
+    """Requests sent vs. connections opened, for LLM and tool traffic together."""
+    with _lock:
+        total_requests = _stats["requests"]
+        total_connections = _stats["connections"]
+        http2 = _stats["http2"]
+    if _session is not None:
+        for adapter in _session.adapters.values():
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools[key]
+                total_requests += pool.num_requests
+                total_connections += pool.num_connections
+    reused = max(total_requests - total_connections, 0)
+    return {
+        "requests": total_requests,
+        "connections": total_connections,
+        "reused": reused,
+        "reuse_ratio": round(reused / total_requests, 2) if total_requests else 0.0,
+        "http2_responses": http2,
+    }
+
+
+def format_stats():
+    stats = connection_stats()
+    return (f"{stats['requests']} requests over {stats['connections']} connections "
+            f"({stats['reuse_ratio']:.0%} reused, {stats['http2_responses']} via HTTP/2)")
+
+# =============================================================================
+# 🚦 PER-HOST LIMITS
+# =============================================================================
+
+class _ReleasingStream(httpx.SyncByteStream):
+    """Holds the host slot until the response body has been read and closed."""
+
+    def __init__(self, stream, release):
+        self._stream = stream
+        self._release = release
+
+    def __iter__(self):
+        yield from self._stream
+
+    def close(self):
+        try:
+            self._stream.close()
+        finally:
+            self._release()
+
+
+class _AsyncReleasingStream(httpx.AsyncByteStream):
+    def __init__(self, stream, release):
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            self._release()
+
+
+def _once(fn):
+    done = []
+    def wrapper():
+        if not done:
+            done.append(True)
+            fn()
+    return wrapper
+
+
+def _prepare(request):
+    _count("requests")
+    request.extensions["trace"] = _trace
+
+
+def _record(response):
+    if response.extensions.get("http_version") == b"HTTP/2":
+        _count("http2")
+
+
+class HostLimitedTransport(httpx.BaseTransport):
+    """Wraps a pooled transport, allowing at most `per_host` requests in flight per host."""
+
+    def __init__(self, transport, per_host):
+        self._transport = transport
+        self._slots = defaultdict(lambda: threading.BoundedSemaphore(per_host))
+        self._slots_lock = threading.Lock()
+
+    def handle_request(self, request):
+        with self._slots_lock:
+            slot = self._slots[request.url.host]
+        slot.acquire()
+        try:
+            _prepare(request)
+            response = self._transport.handle_request(request)
+        except BaseException:
+            slot.release()
+            raise
+        _record(response)
+        response.stream = _ReleasingStream(response.stream, _once(slot.release))
+        return response
+
+    def close(self):
+        self._transport.close()
+
+
+class AsyncHostLimitedTransport(httpx.AsyncBaseTransport):
+    """The asyncio twin of HostLimitedTransport."""
+
+    def __init__(self, transport, per_host):
+        self._transport = transport
+        self._slots = defaultdict(lambda: asyncio.Semaphore(per_host))  # one event loop, no lock needed
+
+    async def handle_async_request(self, request):
+        slot = self._slots[request.url.host]
+        await slot.acquire()
+        try:
+            _prepare(request)
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            slot.release()
+            raise
+        _record(response)
+        response.stream = _AsyncReleasingStream(response.stream, _once(slot.release))
+        return response
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+# =============================================================================
+# 🔌 SHARED CLIENTS
+# =============================================================================
+
+def _limits():
+    return httpx.Limits(
+        max_connections=_setting("HTTP_MAX_CONNECTIONS", 100),
+        max_keepalive_connections=_setting("HTTP_MAX_KEEPALIVE", 20),
+        keepalive_expiry=_setting("HTTP_KEEPALIVE_SECONDS", 60),
+    )
+
+
+def client():
+    """The process-wide httpx client used for LLM traffic."""
+    global _client
+    with _lock:
+        if _client is None:
+            pooled = httpx.HTTPTransport(limits=_limits(), http2=http2_enabled())
+            _client = httpx.Client(
+                transport=HostLimitedTransport(pooled, _setting("HTTP_PER_HOST_LIMIT", 8)),
+                timeout=httpx.Timeout(600.0, connect=10.0),
+            )
+        return _client
+
+
+def async_client():
+    """The process-wide httpx.AsyncClient used for async LLM traffic."""
+    global _async_client
+    with _lock:
+        if _async_client is None:
+            pooled = httpx.AsyncHTTPTransport(limits=_limits(), http2=http2_enabled())
+            _async_client = httpx.AsyncClient(
+                transport=AsyncHostLimitedTransport(pooled, _setting("HTTP_PER_HOST_LIMIT", 8)),
+                timeout=httpx.Timeout(600.0, connect=10.0),
+            )
+        return _async_client
+
+
+def session():
+    """The process-wide requests.Session used by the web tools."""
+    global _session
+    with _lock:
+        if _session is None:
+            # pool_block=True turns pool_maxsize into a per-host concurrency limit.
+            adapter = HTTPAdapter(pool_connections=_setting("HTTP_MAX_KEEPALIVE", 20),
+                                  pool_maxsize=_setting("HTTP_PER_HOST_LIMIT", 8),
+                                  pool_block=True)
+            _session = requests.Session()
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+        return _session
+
+
+class _PooledRequests:
+    """Stands in for the `requests` module inside a tool, sending through the shared session."""
+
+    def __init__(self, pooled):
+        self._session = pooled
+
+    def get(self, url, **kwargs):
+        return self._session.get(url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self._session.post(url, **kwargs)
+
+    def request(self, method, url, **kwargs):
+        return self._session.request(method, url, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(requests, name)  # exceptions, status codes, ...
+
+
+_installed = False
+
+def install():
+    """Routes litellm and the web tools through the shared pools. Safe to call repeatedly."""
+    global _installed
+    if _installed:
+        return
+    _installed = True
+
+    import litellm
+    litellm.client_session = client()
+    litellm.aclient_session = async_client()
+
+    pooled = _PooledRequests(session())
+    for name in TOOL_MODULES:
+        try:
+            module = importlib.import_module(name)
+        except ImportError:
+            continue
+        if getattr(module, "requests", None) is requests:
+            module.requests = pooled